@@ -8,10 +8,10 @@ import shutil
 import matplotlib.pyplot as plt
 from scipy.spatial.distance import jensenshannon
 
+from analysis.table_reader import read_table, table_exists
 from analysis.configuration import get_all_multi_comparision_values, get_multi_comparison_values, set_params, get_comparison_values
 from params.program_params import Mode, ProgramParams
 from program.grid.grid import Grid
-from program.location.location import Location
 
 
 def load_and_merge_data(base_path, filename, dates):
@@ -21,8 +21,8 @@ def load_and_merge_data(base_path, filename, dates):
         # Tripdata data
         file_name = f"{filename}{date}.csv"
         file_path = os.path.join(base_path, file_name)
-        if os.path.exists(file_path):
-            data = pd.read_csv(file_path)
+        if table_exists(file_path):
+            data = read_table(file_path)
             dfs.append(data)
 
     if dfs:
@@ -127,11 +127,11 @@ def calculate_vehicle_distribution(vehicle_data: pd.DataFrame) -> float:
         for row in reader:
             zone_to_city_part[int(row["zone_id"])] = row["city_part"]
 
-    grid = Grid.get_instance()
-    for _, row in vehicle_data.iterrows():
-        vehicle_distribution[
-            zone_to_city_part[grid.find_zone(Location(row["lat"], row["lon"])).id]
-        ] += 1
+    zone_ids = Grid.get_instance().find_zones(
+        vehicle_data["lat"].to_numpy(), vehicle_data["lon"].to_numpy()
+    )
+    for zone_id, count in zip(*np.unique(zone_ids, return_counts=True)):
+        vehicle_distribution[zone_to_city_part[int(zone_id)]] += int(count)
     
     subway_list = list(subway_distribution.values())
     vehicle_list = list(vehicle_distribution.values())
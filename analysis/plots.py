@@ -14,6 +14,7 @@ from geopandas import GeoSeries, GeoDataFrame
 import geopandas as gpd
 
 
+from analysis.table_reader import list_tables, read_table, table_exists
 from analysis.configuration import set_params
 from params.program_params import Mode, ProgramParams
 from program.location.location import Location
@@ -47,11 +48,7 @@ def calculate_linear_regression(values, window_size):
 
 def average_number_of_drivers_per_day():
     tripdata_path = "store/for_hire/rl_relocation/drivers/1000"
-    tripdata_files = [
-        f
-        for f in os.listdir(tripdata_path)
-        if f.endswith(".csv") and f.startswith("tripdata")
-    ]
+    tripdata_files = list_tables(tripdata_path, "tripdata")
 
     average_occupied_drivers = []
     # Extract the data from the filenames of the tripdata files and sort them
@@ -61,8 +58,8 @@ def average_number_of_drivers_per_day():
     for date in dates:
         workload_file_name = f"workload{date}.csv"
         workload_file_path = os.path.join(tripdata_path, workload_file_name)
-        if os.path.exists(workload_file_path):
-            workload_data = pd.read_csv(workload_file_path)
+        if table_exists(workload_file_path):
+            workload_data = read_table(workload_file_path)
             average_occupied_drivers.append(
                 workload_data["num_of_occupied_driver"].mean()
             )
@@ -105,11 +102,7 @@ def average_number_of_drivers_per_day():
 def number_of_routes_per_day():
 
     tripdata_path = "store/for_hire/rl_relocation/drivers/1000"
-    tripdata_files = [
-        f
-        for f in os.listdir(tripdata_path)
-        if f.endswith(".csv") and f.startswith("tripdata")
-    ]
+    tripdata_files = list_tables(tripdata_path, "tripdata")
     routes_per_day = []
 
     dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
@@ -119,8 +112,8 @@ def number_of_routes_per_day():
         # Tripdata data
         tripdata_file_name = f"tripdata{date}.csv"
         tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-        if os.path.exists(tripdata_file_path):
-            tripdata = pd.read_csv(tripdata_file_path)
+        if table_exists(tripdata_file_path):
+            tripdata = read_table(tripdata_file_path)
             routes_per_day.append(len(tripdata))
         else:
             routes_per_day.append(float("nan"))
@@ -158,11 +151,7 @@ def total_time_reduction_per_car_in_minutes():
     total_time_reduction = []
     total_time_reduction_per_car_in_minutes = []
 
-    tripdata_files = [
-        f
-        for f in os.listdir(tripdata_path)
-        if f.endswith(".csv") and f.startswith("tripdata")
-    ]
+    tripdata_files = list_tables(tripdata_path, "tripdata")
     dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
     dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
 
@@ -170,8 +159,8 @@ def total_time_reduction_per_car_in_minutes():
         # Tripdata data
         tripdata_file_name = f"tripdata{date}.csv"
         tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-        if os.path.exists(tripdata_file_path):
-            tripdata = pd.read_csv(tripdata_file_path)
+        if table_exists(tripdata_file_path):
+            tripdata = read_table(tripdata_file_path)
             total_time_reduction.append(tripdata["time_reduction"].sum())
         else:
             total_time_reduction.append(float("nan"))
@@ -221,11 +210,7 @@ def average_time_reduction_per_day():
     total_time_reduction = []
     total_time_reduction_per_car_in_minutes = []
 
-    tripdata_files = [
-        f
-        for f in os.listdir(tripdata_path)
-        if f.endswith(".csv") and f.startswith("tripdata")
-    ]
+    tripdata_files = list_tables(tripdata_path, "tripdata")
     dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
     dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
 
@@ -233,8 +218,8 @@ def average_time_reduction_per_day():
         # Tripdata data
         tripdata_file_name = f"tripdata{date}.csv"
         tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-        if os.path.exists(tripdata_file_path):
-            tripdata = pd.read_csv(tripdata_file_path)
+        if table_exists(tripdata_file_path):
+            tripdata = read_table(tripdata_file_path)
             total_time_reduction.append(tripdata["time_reduction"].sum())
         else:
             total_time_reduction.append(float("nan"))
@@ -305,19 +290,15 @@ def average_trip_distances_per_day_for_direct_routes():
         else:
             raise Exception(f"{zone1_id} or {zone2_id} not found")
 
-    tripdata_files = [
-        f
-        for f in os.listdir(tripdata_path)
-        if f.endswith(".csv") and f.startswith("tripdata")
-    ]
+    tripdata_files = list_tables(tripdata_path, "tripdata")
     dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
     dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
     for date in dates:
         # Tripdata data
         tripdata_file_name = f"tripdata{date}.csv"
         tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-        if os.path.exists(tripdata_file_path):
-            tripdata = pd.read_csv(tripdata_file_path)
+        if table_exists(tripdata_file_path):
+            tripdata = read_table(tripdata_file_path)
             routes_per_day.append(len(tripdata))
             total_time_reduction.append(tripdata["time_reduction"].sum())
             # Calculate distances for each trip in the dataset
@@ -411,19 +392,15 @@ def average_trip_distances_per_day_for_combination_routes():
         else:
             raise Exception(f"{zone1_id} or {zone2_id} not found")
 
-    tripdata_files = [
-        f
-        for f in os.listdir(tripdata_path)
-        if f.endswith(".csv") and f.startswith("tripdata")
-    ]
+    tripdata_files = list_tables(tripdata_path, "tripdata")
     dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
     dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
     for date in dates:
         # Tripdata data
         tripdata_file_name = f"tripdata{date}.csv"
         tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-        if os.path.exists(tripdata_file_path):
-            tripdata = pd.read_csv(tripdata_file_path)
+        if table_exists(tripdata_file_path):
+            tripdata = read_table(tripdata_file_path)
             routes_per_day.append(len(tripdata))
             total_time_reduction.append(tripdata["time_reduction"].sum())
             # Calculate distances for each trip in the dataset
@@ -514,19 +491,15 @@ def visualize_combi_route_ratio():
     direct_routes_per_day = []
     combi_routes_per_day = []
 
-    tripdata_files = [
-        f
-        for f in os.listdir(tripdata_path)
-        if f.endswith(".csv") and f.startswith("tripdata")
-    ]
+    tripdata_files = list_tables(tripdata_path, "tripdata")
     dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
     dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
     for date in dates:
         # Tripdata data
         tripdata_file_name = f"tripdata{date}.csv"
         tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-        if os.path.exists(tripdata_file_path):
-            tripdata = pd.read_csv(tripdata_file_path)
+        if table_exists(tripdata_file_path):
+            tripdata = read_table(tripdata_file_path)
             routes_per_day.append(len(tripdata))
             direct_routes_per_day.append(len(tripdata[tripdata["combi_route"] == False]))
             combi_routes_per_day.append(len(tripdata[tripdata["combi_route"] == True]))
@@ -588,22 +561,16 @@ def visualize_vehicles():
     grid_cells_df = pd.read_csv(grid_cells_path)
     subway_data_df = pd.read_csv(subway_data_path)
     
-    vehicledata_files = [
-        f
-        for f in os.listdir(vehicledata_path)
-        if f.endswith(".csv") and f.startswith("vehicle_data")
-    ]
+    vehicledata_files = list_tables(vehicledata_path, "vehicle_data")
     dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in vehicledata_files]
     dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"), reverse=True)
     vehicledata_file_name = f"vehicle_data{dates[0]}.csv"
     vehicledata_file_path = os.path.join(vehicledata_path, vehicledata_file_name)
-    if os.path.exists(vehicledata_file_path):
-        vehicledata = []
-        with open(vehicledata_file_path, mode="r") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if int(row["total_seconds"]) == 82800:
-                    vehicledata.append({"lat": float(row["lat"]), "lon": float(row["lon"])})
+    if table_exists(vehicledata_file_path):
+        vehicledata = read_table(vehicledata_file_path)
+        vehicledata = vehicledata.loc[
+            vehicledata["total_seconds"] == 82800, ["lat", "lon"]
+        ].reset_index(drop=True)
     vehicle_data_df = pd.DataFrame(vehicledata)
 
     city_borders = gpd.read_file("data/nyc_city_borders/borders.shp")
@@ -640,19 +607,15 @@ def visualize_workload():
     workloaddata_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
     workload_per_day = []
 
-    workloaddata_files = [
-        f
-        for f in os.listdir(workloaddata_path)
-        if f.endswith(".csv") and f.startswith("workload")
-    ]
+    workloaddata_files = list_tables(workloaddata_path, "workload")
     dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in workloaddata_files]
     dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
     for date in dates:
         # Tripdata data
         workloaddata_file_name = f"workload{date}.csv"
         workloaddata_file_path = os.path.join(workloaddata_path, workloaddata_file_name)
-        if os.path.exists(workloaddata_file_path):
-            workloaddata = pd.read_csv(workloaddata_file_path)
+        if table_exists(workloaddata_file_path):
+            workloaddata = read_table(workloaddata_file_path)
             workload_per_day.append(
                 workloaddata["num_of_occupied_driver"].mean() / ProgramParams.AMOUNT_OF_VEHICLES
             )
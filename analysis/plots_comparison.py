@@ -6,6 +6,7 @@ import re
 from matplotlib import pyplot as plt
 from numpy import mean
 import pandas as pd
+from analysis.table_reader import list_tables, read_table, table_exists
 from analysis.configuration import get_comparison_values, set_params
 from analysis.numerical_analysis import calculate_vehicle_distribution
 from params.program_params import ProgramParams
@@ -40,11 +41,7 @@ def time_reduction_per_order(ax, parameter: str, values: list):
         tripdata_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
         time_reduction_per_order = []
 
-        tripdata_files = [
-            f
-            for f in os.listdir(tripdata_path)
-            if f.endswith(".csv") and f.startswith("tripdata")
-        ]
+        tripdata_files = list_tables(tripdata_path, "tripdata")
         dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
         dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
         dates = dates[-7:]
@@ -52,8 +49,8 @@ def time_reduction_per_order(ax, parameter: str, values: list):
             # Tripdata data
             tripdata_file_name = f"tripdata{date}.csv"
             tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-            if os.path.exists(tripdata_file_path):
-                tripdata = pd.read_csv(tripdata_file_path)
+            if table_exists(tripdata_file_path):
+                tripdata = read_table(tripdata_file_path)
                 time_reduction_per_order.append(
                     tripdata["time_reduction"].sum() / 60 / len(tripdata)
                 )
@@ -79,11 +76,7 @@ def amount_of_orders_per_vehicle(ax, parameter: str, values: list):
         tripdata_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
         amount_of_orders_per_vehicle_per_day = []
 
-        tripdata_files = [
-            f
-            for f in os.listdir(tripdata_path)
-            if f.endswith(".csv") and f.startswith("tripdata")
-        ]
+        tripdata_files = list_tables(tripdata_path, "tripdata")
         dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
         dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
         dates = dates[-7:]
@@ -91,8 +84,8 @@ def amount_of_orders_per_vehicle(ax, parameter: str, values: list):
             # Tripdata data
             tripdata_file_name = f"tripdata{date}.csv"
             tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-            if os.path.exists(tripdata_file_path):
-                tripdata = pd.read_csv(tripdata_file_path)
+            if table_exists(tripdata_file_path):
+                tripdata = read_table(tripdata_file_path)
                 amount_of_orders_per_vehicle_per_day.append(
                     len(tripdata) / ProgramParams.AMOUNT_OF_VEHICLES
                 )
@@ -118,11 +111,7 @@ def amount_of_orders(ax, parameter: str, values: list):
         tripdata_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
         amount_of_orders_per_day = []
 
-        tripdata_files = [
-            f
-            for f in os.listdir(tripdata_path)
-            if f.endswith(".csv") and f.startswith("tripdata")
-        ]
+        tripdata_files = list_tables(tripdata_path, "tripdata")
         dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
         dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
         dates = dates[-7:]
@@ -130,8 +119,8 @@ def amount_of_orders(ax, parameter: str, values: list):
             # Tripdata data
             tripdata_file_name = f"tripdata{date}.csv"
             tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-            if os.path.exists(tripdata_file_path):
-                tripdata = pd.read_csv(tripdata_file_path)
+            if table_exists(tripdata_file_path):
+                tripdata = read_table(tripdata_file_path)
                 amount_of_orders_per_day.append(len(tripdata))
             else:
                 amount_of_orders_per_day.append(float("nan"))
@@ -160,11 +149,7 @@ def workload(ax, parameter: str, values: list):
         idle = []
         relocation = []
 
-        vehicle_data_files = [
-            f
-            for f in os.listdir(vehicle_data_path)
-            if f.endswith(".csv") and f.startswith("vehicle_data")
-        ]
+        vehicle_data_files = list_tables(vehicle_data_path, "vehicle_data")
         dates = [
             re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in vehicle_data_files
         ]
@@ -174,8 +159,8 @@ def workload(ax, parameter: str, values: list):
             # Tripdata data
             vehicle_data_filename = f"vehicle_data{date}.csv"
             vehicle_data_filepath = os.path.join(vehicle_data_path, vehicle_data_filename)
-            if os.path.exists(vehicle_data_filepath):
-                vehicle_data = pd.read_csv(vehicle_data_filepath)
+            if table_exists(vehicle_data_filepath):
+                vehicle_data = read_table(vehicle_data_filepath)
                 occupied.append(
                     vehicle_data.loc[
                         vehicle_data["status"] == "occupied", "status"
@@ -244,11 +229,7 @@ def combi_route_quota(ax, parameter: str, values: list):
         tripdata_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
         combi_quota_per_day = []
 
-        tripdata_files = [
-            f
-            for f in os.listdir(tripdata_path)
-            if f.endswith(".csv") and f.startswith("tripdata")
-        ]
+        tripdata_files = list_tables(tripdata_path, "tripdata")
         dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
         dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
         dates = dates[-7:]
@@ -256,8 +237,8 @@ def combi_route_quota(ax, parameter: str, values: list):
             # Tripdata data
             tripdata_file_name = f"tripdata{date}.csv"
             tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-            if os.path.exists(tripdata_file_path):
-                tripdata = pd.read_csv(tripdata_file_path)
+            if table_exists(tripdata_file_path):
+                tripdata = read_table(tripdata_file_path)
                 combi_quota_per_day.append(len(tripdata[tripdata["combi_route"] == True]) / len(tripdata))
             else:
                 combi_quota_per_day.append(float("nan"))
@@ -281,11 +262,7 @@ def vehicle_distribution(ax, parameter: str, values: list):
         vehicle_data_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
         distribution_per_day = []
 
-        vehicle_data_files = [
-            f
-            for f in os.listdir(vehicle_data_path)
-            if f.endswith(".csv") and f.startswith("vehicle_data")
-        ]
+        vehicle_data_files = list_tables(vehicle_data_path, "vehicle_data")
         dates = [
             re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in vehicle_data_files
         ]
@@ -295,8 +272,8 @@ def vehicle_distribution(ax, parameter: str, values: list):
             # Tripdata data
             vehicle_data_file_name = f"vehicle_data{date}.csv"
             vehicle_data_file_path = os.path.join(vehicle_data_path, vehicle_data_file_name)
-            if os.path.exists(vehicle_data_file_path):
-                vehicle_data = pd.read_csv(vehicle_data_file_path)
+            if table_exists(vehicle_data_file_path):
+                vehicle_data = read_table(vehicle_data_file_path)
                 distribution_per_day.append(calculate_vehicle_distribution(vehicle_data))
             else:
                 distribution_per_day.append(float("nan"))
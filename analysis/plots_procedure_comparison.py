@@ -6,6 +6,7 @@ import geopandas as gpd
 from matplotlib import pyplot as plt
 import numpy as np
 import pandas as pd
+from analysis.table_reader import list_tables, read_table, table_exists
 from analysis.configuration import get_procedure_comparison_values, set_params
 from params.program_params import ProgramParams
 import seaborn as sns
@@ -25,22 +26,16 @@ def vehicle_postions_procedures():
 
             vehicledata_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
             
-            vehicledata_files = [
-                f
-                for f in os.listdir(vehicledata_path)
-                if f.endswith(".csv") and f.startswith("vehicle_data")
-            ]
+            vehicledata_files = list_tables(vehicledata_path, "vehicle_data")
             dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in vehicledata_files]
             dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"), reverse=True)
             vehicledata_file_name = f"vehicle_data{dates[0]}.csv"
             vehicledata_file_path = os.path.join(vehicledata_path, vehicledata_file_name)
-            if os.path.exists(vehicledata_file_path):
-                vehicledata = []
-                with open(vehicledata_file_path, mode="r") as file:
-                    reader = csv.DictReader(file)
-                    for row in reader:
-                        if int(row["total_seconds"]) == 82800:
-                            vehicledata.append({"lat": float(row["lat"]), "lon": float(row["lon"])})
+            if table_exists(vehicledata_file_path):
+                vehicledata = read_table(vehicledata_file_path)
+                vehicledata = vehicledata.loc[
+                    vehicledata["total_seconds"] == 82800, ["lat", "lon"]
+                ].reset_index(drop=True)
             vehicle_dfs.append(pd.DataFrame(vehicledata))
 
     city_borders = gpd.read_file("data/nyc_city_borders/borders.shp")
@@ -95,8 +90,8 @@ def usage_and_rejection_procedures():
             order_data_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data/order_data2023-07-24.csv"
             dispatch_data_path = "data/for_hire/orders_2023-07-24.csv"
 
-            vehicle_data = pd.read_csv(vehicle_data_path)
-            order_data = pd.read_csv(order_data_path)
+            vehicle_data = read_table(vehicle_data_path)
+            order_data = read_table(order_data_path)
             dispatch_data = pd.read_csv(dispatch_data_path)
 
             # Konvertierung der pickup_time-Spalte in datetime-Format
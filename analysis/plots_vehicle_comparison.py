@@ -8,6 +8,7 @@ from matplotlib.ticker import PercentFormatter
 import numpy as np
 import pandas as pd
 import geopandas as gpd
+from analysis.table_reader import list_tables, read_table, table_exists
 from analysis.configuration import get_vehicle_comparison_values, set_params
 from analysis.numerical_analysis import calculate_vehicle_distribution
 from params.program_params import ProgramParams
@@ -25,11 +26,7 @@ def time_reduction_per_order_vehicles():
         tripdata_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
         time_reduction_per_order = []
 
-        tripdata_files = [
-            f
-            for f in os.listdir(tripdata_path)
-            if f.endswith(".csv") and f.startswith("tripdata")
-        ]
+        tripdata_files = list_tables(tripdata_path, "tripdata")
         dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
         dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
         dates = dates[-7:]
@@ -37,8 +34,8 @@ def time_reduction_per_order_vehicles():
             # Tripdata data
             tripdata_file_name = f"tripdata{date}.csv"
             tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-            if os.path.exists(tripdata_file_path):
-                tripdata = pd.read_csv(tripdata_file_path)
+            if table_exists(tripdata_file_path):
+                tripdata = read_table(tripdata_file_path)
                 time_reduction_per_order.append(
                     tripdata["time_reduction"].sum() / 60 / len(tripdata)
                 )
@@ -83,11 +80,7 @@ def amount_of_orders_per_vehicle(ax):
         tripdata_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
         amount_of_orders_per_vehicle_per_day = []
 
-        tripdata_files = [
-            f
-            for f in os.listdir(tripdata_path)
-            if f.endswith(".csv") and f.startswith("tripdata")
-        ]
+        tripdata_files = list_tables(tripdata_path, "tripdata")
         dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
         dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
         dates = dates[-7:]
@@ -95,8 +88,8 @@ def amount_of_orders_per_vehicle(ax):
             # Tripdata data
             tripdata_file_name = f"tripdata{date}.csv"
             tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-            if os.path.exists(tripdata_file_path):
-                tripdata = pd.read_csv(tripdata_file_path)
+            if table_exists(tripdata_file_path):
+                tripdata = read_table(tripdata_file_path)
                 amount_of_orders_per_vehicle_per_day.append(
                     len(tripdata) / ProgramParams.AMOUNT_OF_VEHICLES
                 )
@@ -125,11 +118,7 @@ def amount_of_orders(ax):
         tripdata_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
         amount_of_orders_per_day = []
 
-        tripdata_files = [
-            f
-            for f in os.listdir(tripdata_path)
-            if f.endswith(".csv") and f.startswith("tripdata")
-        ]
+        tripdata_files = list_tables(tripdata_path, "tripdata")
         dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
         dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
         dates = dates[-7:]
@@ -137,8 +126,8 @@ def amount_of_orders(ax):
             # Tripdata data
             tripdata_file_name = f"tripdata{date}.csv"
             tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-            if os.path.exists(tripdata_file_path):
-                tripdata = pd.read_csv(tripdata_file_path)
+            if table_exists(tripdata_file_path):
+                tripdata = read_table(tripdata_file_path)
                 amount_of_orders_per_day.append(len(tripdata))
             else:
                 amount_of_orders_per_day.append(float("nan"))
@@ -170,11 +159,7 @@ def workload_vehicles():
         idle = []
         relocation = []
 
-        vehicle_data_files = [
-            f
-            for f in os.listdir(vehicle_data_path)
-            if f.endswith(".csv") and f.startswith("vehicle_data")
-        ]
+        vehicle_data_files = list_tables(vehicle_data_path, "vehicle_data")
         dates = [
             re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in vehicle_data_files
         ]
@@ -184,8 +169,8 @@ def workload_vehicles():
             # Tripdata data
             vehicle_data_filename = f"vehicle_data{date}.csv"
             vehicle_data_filepath = os.path.join(vehicle_data_path, vehicle_data_filename)
-            if os.path.exists(vehicle_data_filepath):
-                vehicle_data = pd.read_csv(vehicle_data_filepath)
+            if table_exists(vehicle_data_filepath):
+                vehicle_data = read_table(vehicle_data_filepath)
                 occupied.append(
                     vehicle_data.loc[
                         vehicle_data["status"] == "occupied", "status"
@@ -243,11 +228,7 @@ def combi_route_quota_vehicles():
         tripdata_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
         combi_quota_per_day = []
 
-        tripdata_files = [
-            f
-            for f in os.listdir(tripdata_path)
-            if f.endswith(".csv") and f.startswith("tripdata")
-        ]
+        tripdata_files = list_tables(tripdata_path, "tripdata")
         dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in tripdata_files]
         dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"))
         dates = dates[-7:]
@@ -255,8 +236,8 @@ def combi_route_quota_vehicles():
             # Tripdata data
             tripdata_file_name = f"tripdata{date}.csv"
             tripdata_file_path = os.path.join(tripdata_path, tripdata_file_name)
-            if os.path.exists(tripdata_file_path):
-                tripdata = pd.read_csv(tripdata_file_path)
+            if table_exists(tripdata_file_path):
+                tripdata = read_table(tripdata_file_path)
                 combi_quota_per_day.append(len(tripdata[tripdata["combi_route"] == True]) / len(tripdata))
             else:
                 combi_quota_per_day.append(float("nan"))
@@ -290,11 +271,7 @@ def vehicle_distribution_vehicles():
         vehicle_data_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
         distribution_per_day = []
 
-        vehicle_data_files = [
-            f
-            for f in os.listdir(vehicle_data_path)
-            if f.endswith(".csv") and f.startswith("vehicle_data")
-        ]
+        vehicle_data_files = list_tables(vehicle_data_path, "vehicle_data")
         dates = [
             re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in vehicle_data_files
         ]
@@ -304,8 +281,8 @@ def vehicle_distribution_vehicles():
             # Tripdata data
             vehicle_data_file_name = f"vehicle_data{date}.csv"
             vehicle_data_file_path = os.path.join(vehicle_data_path, vehicle_data_file_name)
-            if os.path.exists(vehicle_data_file_path):
-                vehicle_data = pd.read_csv(vehicle_data_file_path)
+            if table_exists(vehicle_data_file_path):
+                vehicle_data = read_table(vehicle_data_file_path)
                 distribution_per_day.append(calculate_vehicle_distribution(vehicle_data))
             else:
                 distribution_per_day.append(float("nan"))
@@ -336,22 +313,16 @@ def vehicle_postions_vehicles():
 
         vehicledata_path = f"store/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
         
-        vehicledata_files = [
-            f
-            for f in os.listdir(vehicledata_path)
-            if f.endswith(".csv") and f.startswith("vehicle_data")
-        ]
+        vehicledata_files = list_tables(vehicledata_path, "vehicle_data")
         dates = [re.search(r"(\d{4}-\d{2}-\d{2})", f).group(1) for f in vehicledata_files]
         dates.sort(key=lambda date: datetime.strptime(date, "%Y-%m-%d"), reverse=True)
         vehicledata_file_name = f"vehicle_data{dates[0]}.csv"
         vehicledata_file_path = os.path.join(vehicledata_path, vehicledata_file_name)
-        if os.path.exists(vehicledata_file_path):
-            vehicledata = []
-            with open(vehicledata_file_path, mode="r") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    if int(row["total_seconds"]) == 82800:
-                        vehicledata.append({"lat": float(row["lat"]), "lon": float(row["lon"])})
+        if table_exists(vehicledata_file_path):
+            vehicledata = read_table(vehicledata_file_path)
+            vehicledata = vehicledata.loc[
+                vehicledata["total_seconds"] == 82800, ["lat", "lon"]
+            ].reset_index(drop=True)
         vehicle_dfs.append(pd.DataFrame(vehicledata))
 
     city_borders = gpd.read_file("data/nyc_city_borders/borders.shp")
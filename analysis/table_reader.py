@@ -0,0 +1,45 @@
+import os
+import pandas as pd
+
+# Output tables can be written as parquet, feather or csv, columnar files are preferred when several exist.
+# Columnar tables are directories of part files, which are read in the order they were written.
+TABLE_EXTENSIONS = [".parquet", ".feather", ".csv"]
+
+
+# Returns the path of the preferred format of a table given by its csv path, or None if no format exists
+def find_table(csv_file_path: str):
+    stem = os.path.splitext(csv_file_path)[0]
+    for extension in TABLE_EXTENSIONS:
+        if os.path.exists(stem + extension):
+            return stem + extension
+    return None
+
+
+def table_exists(csv_file_path: str) -> bool:
+    return find_table(csv_file_path) != None
+
+
+def read_table(csv_file_path: str) -> pd.DataFrame:
+    file_path = find_table(csv_file_path)
+    if file_path == None:
+        raise Exception(f"No table found for {csv_file_path}")
+    if file_path.endswith(".csv"):
+        return pd.read_csv(file_path)
+    read = pd.read_parquet if file_path.endswith(".parquet") else pd.read_feather
+    extension = os.path.splitext(file_path)[1]
+    # Parts still under their temporary name were not completely written
+    parts = sorted(f for f in os.listdir(file_path) if f.endswith(extension))
+    if len(parts) == 0:
+        return pd.DataFrame()
+    return pd.concat([read(os.path.join(file_path, part)) for part in parts], ignore_index=True)
+
+
+# File names of all tables in a directory starting with the prefix, one per table in its preferred format
+def list_tables(path: str, prefix: str) -> list[str]:
+    file_names = [
+        f
+        for f in os.listdir(path)
+        if f.startswith(prefix) and os.path.splitext(f)[1] in TABLE_EXTENSIONS
+    ]
+    stems = sorted(set(os.path.splitext(f)[0] for f in file_names))
+    return [os.path.basename(find_table(os.path.join(path, stem + ".csv"))) for stem in stems]
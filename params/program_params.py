@@ -1,6 +1,5 @@
 from datetime import datetime
 from enum import Enum
-from program.interval.time import Time
 
 class Mode(Enum):
     GRAPH_REINFORCEMENT_LEARNING = "grl"
@@ -9,6 +8,18 @@ class Mode(Enum):
     Q_LEARNING = "rl"
     DEEP_Q_LEARNING = "drl"
 
+class OutputFormat(Enum):
+    CSV = "csv"
+    # Columnar formats with typed and compressed columns, need pyarrow
+    PARQUET = "parquet"
+    FEATHER = "feather"
+
+class TransitRouting(Enum):
+    # Fastest connections of all station pairs precomputed in data/shortest_paths.csv
+    TABLE = "table"
+    # Point to point queries on the station graph, for networks too large for the table
+    ROUTER = "router"
+
 class DataSet(Enum):
     YELLOW_CAB = "yellow_cab"
     FOR_HIRE = "for_hire"
@@ -23,6 +34,24 @@ class ProgramParams:
 
     DATA_SET = DataSet.FOR_HIRE
 
+    # Seeds the placement of orders on the grid cells of their zones, see Orders.cell_sampling_generators
+    ORDER_SAMPLING_SEED = 0
+
+    # Minutes of orders created ahead of the simulation, order objects of other minutes are not kept in memory.
+    # Values below 1 only create the orders of the current minute
+    ORDER_READ_AHEAD_MINUTES = 60
+
+    # Output tables are written every amount of records per table or simulated minutes
+    DATA_COLLECTOR_FLUSH_RECORDS = 10000
+    DATA_COLLECTOR_FLUSH_MINUTES = 60
+
+    DATA_OUTPUT_FORMAT = OutputFormat.CSV
+
+    TRANSIT_ROUTING = TransitRouting.TABLE
+    # Amount of landmarks of the transit router and station pairs kept in its cache
+    TRANSIT_ROUTER_LANDMARKS = 16
+    TRANSIT_ROUTER_CACHE_SIZE = 100000
+
 
     ######################################################################################################
     ############### Hyperparameters ###############
@@ -84,24 +113,28 @@ class ProgramParams:
     # File paths to orders
     def ORDERS_FILE_PATH() :
         return f"data/{ProgramParams.DATA_SET.value}/orders_{ProgramParams.SIMULATION_DATE.strftime('%Y-%m-%d')}.csv"
+
+    # Binary order cache of one day and sampling seed, created from the orders file by the static data generation
+    def ORDERS_CACHE_FILE_PATH() :
+        return f"data/{ProgramParams.DATA_SET.value}/orders_{ProgramParams.SIMULATION_DATE.strftime('%Y-%m-%d')}_seed_{ProgramParams.ORDER_SAMPLING_SEED}.bin"
     
     # Time it takes until the simulation updates in seconds
     SIMULATION_UPDATE_RATE = 60 #FIX
 
-    # Medium waiting time
-    def PUBLIC_TRANSPORT_WAITING_TIME(time: Time):
-        rush_hours_morning = Time(6, 30, 0)
-        middays = Time(9, 30, 0)
-        rush_hours_afternoon = Time(15, 30, 0)
-        evenings = Time(20, 0, 0)
+    # Medium waiting time, time in total seconds
+    def PUBLIC_TRANSPORT_WAITING_TIME(total_seconds: int):
+        rush_hours_morning = 6 * 3600 + 30 * 60
+        middays = 9 * 3600 + 30 * 60
+        rush_hours_afternoon = 15 * 3600 + 30 * 60
+        evenings = 20 * 3600
 
-        if time.is_before(rush_hours_morning):
+        if total_seconds <= rush_hours_morning:
             return 600  # late nights waiting duration
-        if time.is_before(middays):
+        if total_seconds <= middays:
             return 150  # rush hours morning waiting duration
-        if time.is_before(rush_hours_afternoon):
+        if total_seconds <= rush_hours_afternoon:
             return 300  # middays waiting duration
-        if time.is_before(evenings):
+        if total_seconds <= evenings:
             return 150  # rush hours afternoon waiting duration
         return 450  # evenings waiting duration
         # Source: https://www.introducingnewyork.com/subway
@@ -162,5 +195,21 @@ class ProgramParams:
             ProgramParams.DIRECT_TRIP_DISCOUNT_FACTOR = float(value)
         elif member == "MAIN_AND_TARGET_NET_SYNC_ITERATIONS":
             ProgramParams.MAIN_AND_TARGET_NET_SYNC_ITERATIONS = int(value)
+        elif member == "ORDER_SAMPLING_SEED":
+            ProgramParams.ORDER_SAMPLING_SEED = int(value)
+        elif member == "ORDER_READ_AHEAD_MINUTES":
+            ProgramParams.ORDER_READ_AHEAD_MINUTES = int(value)
+        elif member == "DATA_COLLECTOR_FLUSH_RECORDS":
+            ProgramParams.DATA_COLLECTOR_FLUSH_RECORDS = int(value)
+        elif member == "DATA_COLLECTOR_FLUSH_MINUTES":
+            ProgramParams.DATA_COLLECTOR_FLUSH_MINUTES = int(value)
+        elif member == "DATA_OUTPUT_FORMAT":
+            ProgramParams.DATA_OUTPUT_FORMAT = OutputFormat(value)
+        elif member == "TRANSIT_ROUTING":
+            ProgramParams.TRANSIT_ROUTING = TransitRouting(value)
+        elif member == "TRANSIT_ROUTER_LANDMARKS":
+            ProgramParams.TRANSIT_ROUTER_LANDMARKS = int(value)
+        elif member == "TRANSIT_ROUTER_CACHE_SIZE":
+            ProgramParams.TRANSIT_ROUTER_CACHE_SIZE = int(value)
         else:
             raise Exception(f"No parameter found with name {member}")
\ No newline at end of file
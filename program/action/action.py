@@ -5,6 +5,8 @@ ID_PROVIDER = IdProvider()
 class Action:
     from program.order.route import Route
 
+    __slots__ = ("id", "route")
+
     def __init__(self, route: Route) -> None:
         self.id = ID_PROVIDER.get_id()
         self.route = route
@@ -4,6 +4,8 @@ from program.location.location import Location
 
 
 class VehicleActionPair:
+    __slots__ = ("vehicle", "action", "weight")
+
     def __init__(self, vehicle: Vehicle, action: Action, weight: float) -> None:
         self.vehicle = vehicle
         self.action = action
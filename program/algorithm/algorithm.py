@@ -3,83 +3,53 @@ from program.algorithm.model_builder import or_tools_min_cost_flow
 from program.data_collector import DataCollector
 from program.vehicle.vehicles import Vehicles
 from program.grid.grid import Grid
+from program.interval.time import Time
 from program.interval.time_series import TimeSeries
 from program.logger import LOGGER
 from params.program_params import Mode, ProgramParams
-from program.public_transport.fastest_station_connection_network import (
-    FastestStationConnectionNetwork,
-)
 from program.action.action import Action
 from program.vehicle.vehicle import Vehicle
+from program.vehicle.vehicle_index import VehicleIndex
 from program.order.order import Order
 from program.order.route import Route
+from program.public_transport.fastest_station_connection_network import FastestStationConnectionNetwork
+from program.public_transport.station_path import StationPath
 from program.state.state import State
 from program.state.state_value_networks import StateValueNetworks
 
 
 # The so called 'Algorithm 1' of Feng et al. (2022)
 def generate_routes(orders: list[Order]) -> dict[Order, list[Route]]:
-    routes_per_order = {order: [] for order in orders}
     fastest_connection_network = FastestStationConnectionNetwork.get_instance()
+    routes_per_order = {order: [] for order in orders}
     for order in orders:
         default_route = Route.regular_route(order)
         routes_per_order[order].append(default_route)
-        start = order.start
-        end = order.end
-
-        if order.direct_connection[1] > ProgramParams.L1:
-            # 1. Get the closest start and end station for each line
-            from program.public_transport.station import Station
-
-            origins: list[Station] = []
-            destinations: list[Station] = []
-            for line in fastest_connection_network.lines:
-                origins.append(line.get_closest_station(start))
-                destinations.append(line.get_closest_station(end))
-
-            # 2. Generate combination routes
-            for origin in origins:
-                for destination in destinations:
-                    if origin == destination:
-                        continue
-                    connection = fastest_connection_network.get_fastest_connection(
-                        origin, destination
-                    )
-
-                    # Distance (time in second)
-                    vehicle_time = (
-                        start.distance_to(origin.position) / ProgramParams.VEHICLE_SPEED
-                    )
-                    walking_time = (
-                        destination.position.distance_to(end)
-                        / ProgramParams.WALKING_SPEED
-                    )
-                    transit_time = connection[1]
-                    stations = connection[0]
-                    # include entry, exit and waiting time
-                    other_time = (
-                        2 * ProgramParams.PUBLIC_TRANSPORT_ENTRY_EXIT_TIME
-                        + ProgramParams.PUBLIC_TRANSPORT_WAITING_TIME(
-                            order.dispatch_time
-                        )
-                    )
-                    total_time = vehicle_time + walking_time + transit_time + other_time
-
-                    # Since we want people to use public transport, here we check against the direct_connection without any bus
-                    if total_time < order.direct_connection[1] + ProgramParams.L2:
-                        routes_per_order[order].append(
-                            Route(
-                                order,
-                                start,
-                                end,
-                                stations,
-                                vehicle_time,
-                                transit_time,
-                                walking_time,
-                                other_time,
-                                total_time,
-                            )
-                        )
+
+        # The closest stations and legs of all combination routes are computed on dispatch
+        candidates = order.route_candidates
+        for (source, target, vehicle_time, transit_time, walking_time, other_time, total_time) in zip(
+            candidates.sources.tolist(),
+            candidates.targets.tolist(),
+            candidates.vehicle_times.tolist(),
+            candidates.transit_times.tolist(),
+            candidates.walking_times.tolist(),
+            candidates.other_times.tolist(),
+            candidates.total_times.tolist(),
+        ):
+            routes_per_order[order].append(
+                Route(
+                    order,
+                    order.start,
+                    order.end,
+                    StationPath(fastest_connection_network, source, target),
+                    vehicle_time,
+                    transit_time,
+                    walking_time,
+                    other_time,
+                    total_time,
+                )
+            )
     return routes_per_order
 
 
@@ -103,8 +73,9 @@ def generate_vehicle_action_pairs(
             state_value = StateValueNetworks.get_instance().get_target_state_value(
                 idling,
                 Grid.get_instance().find_zone(vehicle.current_position),
-                State.get_state().current_time.add_seconds(
-                    ProgramParams.SIMULATION_UPDATE_RATE
+                Time.wrap_total_seconds(
+                    State.get_state().current_total_seconds
+                    + ProgramParams.SIMULATION_UPDATE_RATE
                 ),
             )
         else:
@@ -121,36 +92,42 @@ def generate_vehicle_action_pairs(
             order_to_actions_dict[order].append(Action(route))
 
     operated_orders = set()
-    vehicle_to_orders_dict: dict[Vehicle, list[Order]] = {}
+    vehicle_to_orders_dict: dict[Vehicle, list[Order]] = {
+        vehicle: [] for vehicle in available_vehicles
+    }
     # 3. Generate vehicle-order pairs for each vehicle available
-    for vehicle in available_vehicles:
-        vehicle_to_orders_dict[vehicle] = []
-        for order in order_to_actions_dict:
-            if (
-                order.start.distance_to(vehicle.current_position)
-                <= ProgramParams.PICK_UP_DISTANCE_THRESHOLD
-            ):
-                operated_orders.add(order)
-                vehicle_to_orders_dict[vehicle].append(order)
+    # Only vehicles in the buckets around the order start need to be checked
+    vehicle_index = VehicleIndex(
+        available_vehicles, ProgramParams.PICK_UP_DISTANCE_THRESHOLD
+    )
+    for order in order_to_actions_dict:
+        for vehicle in vehicle_index.find_vehicles_in_range(order.start):
+            operated_orders.add(order)
+            vehicle_to_orders_dict[vehicle].append(order)
 
     best_actions: dict[Order, tuple[Action, float]] = {}
+    current_total_seconds = State.get_state().current_total_seconds
     # 4. Calculate the actions Q-value for each route that maybe operated and save the best action
     for order in operated_orders:
         actions: list[tuple[Action, float]] = []
         # Calculate Q-values for all actions
         for action in order_to_actions_dict[order]:
             # For the Q-value calculation we expect the medium pickup distance threshold driving time
-            arrival_time = State.get_state().current_time.add_seconds(
-                ProgramParams.PICK_UP_DISTANCE_THRESHOLD
-                / ProgramParams.VEHICLE_SPEED
-                / 2
-            ).add_seconds(action.route.vehicle_time)
+            arrival_total_seconds = Time.wrap_total_seconds(
+                Time.wrap_total_seconds(
+                    current_total_seconds
+                    + ProgramParams.PICK_UP_DISTANCE_THRESHOLD
+                    / ProgramParams.VEHICLE_SPEED
+                    / 2
+                )
+                + action.route.vehicle_time
+            )
             # weight = time reduction for passenger + state value after this option
             if ProgramParams.EXECUTION_MODE == Mode.GRAPH_REINFORCEMENT_LEARNING:
                 state_value = StateValueNetworks.get_instance().get_target_state_value(
                     action,
                     action.route.vehicle_destination_cell.zone,
-                    arrival_time,
+                    arrival_total_seconds,
                 )
             else:
                 # Baseline Performance
@@ -159,7 +136,7 @@ def generate_vehicle_action_pairs(
             weight = (
                 action.route.time_reduction
                 + ProgramParams.DISCOUNT_FACTOR(
-                    State.get_state().current_time.distance_to(arrival_time)
+                    abs(arrival_total_seconds - current_total_seconds)
                 )
                 * state_value
             )
@@ -195,16 +172,9 @@ def solve_optimization_problem(
 ) -> list[VehicleActionPair]:
     # solve_as_min_cost_flow_problem(vehicle_action_pairs)
     vehicle_action_pairs = or_tools_min_cost_flow(vehicle_action_pairs)
-    vehicles = Vehicles.get_vehicles()
-    occupied_vehicles = len(list(filter(lambda x: x.is_occupied(), vehicles)))
-    relocated_vehicles = len(
-        list(
-            filter(
-                lambda x: x.is_occupied() and x.job.is_relocation,
-                vehicles,
-            )
-        )
-    )
+    fleet = Vehicles.get_fleet()
+    occupied_vehicles = int(fleet.is_occupied.sum())
+    relocated_vehicles = int((fleet.is_occupied & fleet.is_relocation).sum())
     idling_vehicles = len(
         list(filter(lambda x: x.action.is_idling(), vehicle_action_pairs))
     )
@@ -213,11 +183,11 @@ def solve_optimization_problem(
     LOGGER.debug(
         f"Matched vehicles: {matched_vehicles}, Occupied vehicles: {occupied_vehicles}, Relocated vehicles: {relocated_vehicles}, Idling vehicles: {idling_vehicles}"
     )
-    DataCollector.append_workload(State.get_state().current_time, occupied_vehicles)
+    DataCollector.append_workload(State.get_state().current_total_seconds, occupied_vehicles)
     for pair in vehicle_action_pairs:
         if pair.action.is_idling():
             continue
-        current_time = State.get_state().current_time
+        current_total_seconds = State.get_state().current_total_seconds
         vehicle_zone = Grid.get_instance().find_zone(pair.vehicle.current_position)
         passenger_pu_zone = pair.action.route.order.zone
         passenger_do_zone = Grid.get_instance().find_zone(
@@ -229,7 +199,7 @@ def solve_optimization_problem(
         combi_route = not pair.action.route.is_regular_route()
         total_vehicle_distance = pair.get_total_vehicle_distance()
         DataCollector.append_trip(
-            current_time,
+            current_total_seconds,
             vehicle_zone,
             passenger_pu_zone,
             passenger_do_zone,
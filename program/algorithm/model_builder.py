@@ -155,7 +155,7 @@ def or_tools_min_cost_flow(vehicle_action_pairs: list[VehicleActionPair]) -> lis
     ProgramStats.SUM_OF_TIMESAFE += sum(list(map(lambda pair: pair.action.route.time_reduction, filter(lambda pair: pair.action.is_route(), matches))))
     LOGGER.debug(f"Sum of timesafe: {ProgramStats.SUM_OF_TIMESAFE}")
 
-    hours = (State.get_state().current_time.to_total_minutes() - TimeSeries.get_instance().start_time.to_total_minutes()) / 60
+    hours = (State.get_state().current_total_seconds // 60 - TimeSeries.get_instance().start_time.to_total_minutes()) / 60
     hours = hours if hours > 0.1 else 0.1
     LOGGER.debug(f"Sum of timesafe per car, per hour, in minutes: {ProgramStats.SUM_OF_TIMESAFE / len(Vehicles.get_vehicles()) / hours / 60}")
     return matches
@@ -1,32 +1,200 @@
 import csv
 import os
-from program.interval.time import Time
+import shutil
+from collections.abc import Callable
 from program.order.order import Order
 from program.location.location import Location
 from program.zone.zone import Zone
-from params.program_params import ProgramParams
+from params.program_params import OutputFormat, ProgramParams
 
 
+# Buffered writer of one output table, the file is opened with its header on the first flush.
+# Columnar formats write each flush as one closed part file with the typed columns of the table into a
+# directory named like the table, so all flushed records stay readable if the process dies mid-day.
+class TableWriter:
+    def __init__(self, file_name: Callable[[], str], columns: list[tuple[str, str]]) -> None:
+        # Evaluated on opening since the file name depends on the simulation date
+        self.file_name = file_name
+        # Names and arrow types of the columns
+        self.columns = columns
+        self.schema = None
+        self.buffer: list[tuple] = []
+        self.file = None
+        self.writer = None
+        self.is_open = False
+        self.file_path = None
+        self.part_count = 0
+
+    def append(self, record: tuple) -> None:
+        self.buffer.append(record)
+        if len(self.buffer) >= ProgramParams.DATA_COLLECTOR_FLUSH_RECORDS:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.is_open:
+            self.open()
+        if ProgramParams.DATA_OUTPUT_FORMAT == OutputFormat.CSV:
+            self.writer.writerows(self.buffer)
+            self.file.flush()
+        elif len(self.buffer) > 0:
+            import pyarrow as pa
+
+            values = list(zip(*self.buffer))
+            self.write_part(
+                pa.table(
+                    [pa.array(values[k], type=self.schema.field(k).type) for k in range(len(self.columns))],
+                    schema=self.schema,
+                )
+            )
+        self.buffer.clear()
+
+    def open(self) -> None:
+        self.file_path = f"{DataCollector.output_path()}/{self.file_name()}.{ProgramParams.DATA_OUTPUT_FORMAT.value}"
+        self.is_open = True
+        if ProgramParams.DATA_OUTPUT_FORMAT == OutputFormat.CSV:
+            self.file = open(self.file_path, mode="w")
+            self.writer = csv.writer(self.file)
+            self.writer.writerow([name for (name, _) in self.columns])
+            return
+
+        # Only needed for columnar output
+        import pyarrow as pa
+
+        self.schema = pa.schema(
+            [(name, pa.type_for_alias(type)) for (name, type) in self.columns]
+        )
+        # Parts of an earlier run would be read together with the new ones
+        if os.path.isdir(self.file_path):
+            shutil.rmtree(self.file_path)
+        elif os.path.exists(self.file_path):
+            os.remove(self.file_path)
+        os.makedirs(self.file_path)
+        self.part_count = 0
+
+    # Parts are written under a temporary name first, so a part is either complete or missing
+    def write_part(self, table) -> None:
+        extension = ProgramParams.DATA_OUTPUT_FORMAT.value
+        part_path = f"{self.file_path}/part-{self.part_count:05d}.{extension}"
+        if ProgramParams.DATA_OUTPUT_FORMAT == OutputFormat.PARQUET:
+            import pyarrow.parquet as pq
+
+            pq.write_table(table, f"{part_path}.tmp", compression="zstd")
+        else:
+            # Feather version 2 is the arrow IPC file format
+            import pyarrow.feather as feather
+
+            feather.write_feather(table, f"{part_path}.tmp", compression="zstd")
+        os.replace(f"{part_path}.tmp", part_path)
+        self.part_count += 1
+
+    def close(self) -> None:
+        self.flush()
+        if self.file != None:
+            self.file.close()
+        elif self.part_count == 0:
+            # Tables without records still have their columns
+            self.write_part(self.schema.empty_table())
+        self.file = None
+        self.writer = None
+        self.is_open = False
+
+    def discard(self) -> None:
+        self.buffer.clear()
+        if self.file != None:
+            self.file.close()
+        self.file = None
+        self.writer = None
+        self.is_open = False
+
+
+def _dated(name: str):
+    return lambda: f"{name}{ProgramParams.SIMULATION_DATE.strftime('%Y-%m-%d')}"
+
+
+# Streams all records into buffered table writers, which flush every DATA_COLLECTOR_FLUSH_RECORDS
+# records of a table and every DATA_COLLECTOR_FLUSH_MINUTES simulated minutes
 class DataCollector:
     # [(total_seconds, num_of_occupied_driver)]
-    workload = []
+    workload = TableWriter(
+        _dated("workload"),
+        [("total_seconds", "int64"), ("num_of_occupied_driver", "int64")],
+    )
 
     # [(total_seconds, start_zone_id, end_zone_id, distance)]
-    relocation_trip_data = []
+    relocation_trip_data = TableWriter(
+        _dated("relocation_trip_data"),
+        [
+            ("total_seconds", "int64"),
+            ("start_zone_id", "int64"),
+            ("end_zone_id", "int64"),
+            ("distance", "int64"),
+        ],
+    )
 
     # [(total_seconds, id, status, lat, lon)]
     # Will be saved each hour
-    driver_data = []
+    driver_data = TableWriter(
+        _dated("vehicle_data"),
+        [
+            ("total_seconds", "int64"),
+            ("id", "int64"),
+            ("status", "string"),
+            ("lat", "float64"),
+            ("lon", "float64"),
+        ],
+    )
 
     # [(total_seconds, quota_of_unserved_orders, num_of_served_orders)]
-    orders_data = []
+    orders_data = TableWriter(
+        _dated("order_data"),
+        [
+            ("total_seconds", "int64"),
+            ("quota_of_unserved_orders", "float64"),
+            ("num_of_served_orders", "int64"),
+        ],
+    )
 
     # [(total_seconds, quota_of_saved_time_for_all_served_orders)]
-    time_reduction_quota = []
+    time_reduction_quota = TableWriter(
+        _dated("average_time_reduction"),
+        [
+            ("total_seconds", "int64"),
+            ("quota_of_saved_time_for_all_served_orders", "float64"),
+        ],
+    )
 
-    zone_id_list = []
+    zone_id_list = TableWriter(
+        lambda: "cell_id", [("total_seconds", "int64"), ("cell_id", "int64")]
+    )
     # [(total_seconds, driver_start_zone_id, passenger_pickup_zone_id, passenger_dropoff_zone_id, destination_id, vehicle_trip_time, time_reduction, combi_route, total_vehicle_distance)]
-    trip_data = []
+    trip_data = TableWriter(
+        _dated("tripdata"),
+        [
+            ("total_seconds", "int64"),
+            ("driver_start_zone_id", "int64"),
+            ("passenger_pickup_zone_id", "int64"),
+            ("passenger_dropoff_zone_id", "int64"),
+            ("destination_id", "int64"),
+            ("vehicle_trip_time", "float64"),
+            ("time_reduction", "float64"),
+            ("combi_route", "bool"),
+            ("total_vehicle_distance", "float64"),
+        ],
+    )
+
+    # Simulated time of the last flush of all tables
+    last_flush_seconds = 0
+
+    def tables() -> list[TableWriter]:
+        return [
+            DataCollector.workload,
+            DataCollector.relocation_trip_data,
+            DataCollector.driver_data,
+            DataCollector.orders_data,
+            DataCollector.time_reduction_quota,
+            DataCollector.zone_id_list,
+            DataCollector.trip_data,
+        ]
 
     def output_path() -> str:
         path = f"data_output/{ProgramParams.DATA_OUTPUT_FILE_PATH()}/data"
@@ -34,48 +202,48 @@ class DataCollector:
             os.makedirs(path)
         return path
 
-    def append_workload(current_time: Time, num_of_occupied_driver: int):
+    def append_workload(total_seconds: int, num_of_occupied_driver: int):
         DataCollector.workload.append(
-            (current_time.to_total_seconds(), num_of_occupied_driver)
+            (total_seconds, num_of_occupied_driver)
         )
 
     def append_relocation_trip_data(
-        current_time: Time, start_zone: Zone, end_zone: Zone, distance: int
+        total_seconds: int, start_zone: Zone, end_zone: Zone, distance: int
     ):
         DataCollector.relocation_trip_data.append(
-            (current_time.to_total_seconds(), start_zone.id, end_zone.id, distance)
+            (total_seconds, start_zone.id, end_zone.id, distance)
         )
 
     def append_driver_data(
-        current_time: Time, id: int, status: str, position: Location
+        total_seconds: int, id: int, status: str, position: Location
     ):
         DataCollector.driver_data.append(
-            (current_time.to_total_seconds(), id, status, position.lat, position.lon)
+            (total_seconds, id, status, position.lat, position.lon)
         )
 
     def append_orders_data(
-        current_time: Time, quota_of_unserved_orders: float, num_of_served_orders: int
+        total_seconds: int, quota_of_unserved_orders: float, num_of_served_orders: int
     ):
         DataCollector.orders_data.append(
             (
-                current_time.to_total_seconds(),
+                total_seconds,
                 quota_of_unserved_orders,
                 num_of_served_orders,
             )
         )
 
     def append_time_reduction_quota(
-        current_time: Time, quota_of_saved_time_for_all_served_orders: float
+        total_seconds: int, quota_of_saved_time_for_all_served_orders: float
     ):
         DataCollector.time_reduction_quota.append(
-            (current_time.to_total_seconds(), quota_of_saved_time_for_all_served_orders)
+            (total_seconds, quota_of_saved_time_for_all_served_orders)
         )
 
-    def append_zone_id(current_time: Time, zone_id: int):
-        DataCollector.zone_id_list.append((current_time.to_total_seconds(), zone_id))
+    def append_zone_id(total_seconds: int, zone_id: int):
+        DataCollector.zone_id_list.append((total_seconds, zone_id))
 
     def append_trip(
-        current_time: Time,
+        total_seconds: int,
         driver_zone: Zone,
         passenger_pu_zone: Zone,
         passenger_do_zone: Zone,
@@ -87,7 +255,7 @@ class DataCollector:
     ):
         DataCollector.trip_data.append(
             (
-                current_time.to_total_seconds(),
+                total_seconds,
                 driver_zone.id,
                 passenger_pu_zone.id,
                 passenger_do_zone.id,
@@ -99,79 +267,19 @@ class DataCollector:
             )
         )
 
+    # Flushes all tables when DATA_COLLECTOR_FLUSH_MINUTES simulated minutes passed since the last flush
+    def flush_if_due(total_seconds: int):
+        if total_seconds - DataCollector.last_flush_seconds >= ProgramParams.DATA_COLLECTOR_FLUSH_MINUTES * 60:
+            for table in DataCollector.tables():
+                table.flush()
+            DataCollector.last_flush_seconds = total_seconds
+
+    # Writes the remaining records and closes all tables of the day
     def export_all_data():
-        csv_file_path = f"{DataCollector.output_path()}/workload{ProgramParams.SIMULATION_DATE.strftime('%Y-%m-%d')}.csv"
-        with open(csv_file_path, mode="w") as file:
-            writer = csv.writer(file)
-            writer.writerow(["total_seconds", "num_of_occupied_driver"])
-            for w in DataCollector.workload:
-                writer.writerow([w[0], w[1]])
-
-        csv_file_path = f"{DataCollector.output_path()}/relocation_trip_data{ProgramParams.SIMULATION_DATE.strftime('%Y-%m-%d')}.csv"
-        with open(csv_file_path, mode="w") as file:
-            writer = csv.writer(file)
-            writer.writerow(
-                ["total_seconds", "start_zone_id", "end_zone_id", "distance"]
-            )
-            for w in DataCollector.relocation_trip_data:
-                writer.writerow([w[0], w[1], w[2], w[3]])
-
-        csv_file_path = f"{DataCollector.output_path()}/vehicle_data{ProgramParams.SIMULATION_DATE.strftime('%Y-%m-%d')}.csv"
-        with open(csv_file_path, mode="w") as file:
-            writer = csv.writer(file)
-            writer.writerow(["total_seconds", "id", "status", "lat", "lon"])
-            for w in DataCollector.driver_data:
-                writer.writerow([w[0], w[1], w[2], w[3], w[4]])
-
-        csv_file_path = f"{DataCollector.output_path()}/order_data{ProgramParams.SIMULATION_DATE.strftime('%Y-%m-%d')}.csv"
-        with open(csv_file_path, mode="w") as file:
-            writer = csv.writer(file)
-            writer.writerow(
-                ["total_seconds", "quota_of_unserved_orders", "num_of_served_orders"]
-            )
-            for w in DataCollector.orders_data:
-                writer.writerow([w[0], w[1], w[2]])
-
-        csv_file_path = f"{DataCollector.output_path()}/average_time_reduction{ProgramParams.SIMULATION_DATE.strftime('%Y-%m-%d')}.csv"
-        with open(csv_file_path, mode="w") as file:
-            writer = csv.writer(file)
-            writer.writerow(
-                ["total_seconds", "quota_of_saved_time_for_all_served_orders"]
-            )
-            for w in DataCollector.time_reduction_quota:
-                writer.writerow([w[0], w[1]])
-
-        csv_file_path = f"{DataCollector.output_path()}/cell_id.csv"
-        with open(csv_file_path, mode="w") as file:
-            writer = csv.writer(file)
-            writer.writerow(["total_seconds", "cell_id"])
-            for w in DataCollector.zone_id_list:
-                writer.writerow([w[0], w[1]])
-
-        csv_file_path = f"{DataCollector.output_path()}/tripdata{ProgramParams.SIMULATION_DATE.strftime('%Y-%m-%d')}.csv"
-        with open(csv_file_path, mode="w") as file:
-            writer = csv.writer(file)
-            writer.writerow(
-                [
-                    "total_seconds",
-                    "driver_start_zone_id",
-                    "passenger_pickup_zone_id",
-                    "passenger_dropoff_zone_id",
-                    "destination_id",
-                    "vehicle_trip_time",
-                    "time_reduction",
-                    "combi_route",
-                    "total_vehicle_distance",
-                ]
-            )
-            for w in DataCollector.trip_data:
-                writer.writerow([w[0], w[1], w[2], w[3], w[4], w[5], w[6], w[7], w[8]])
+        for table in DataCollector.tables():
+            table.close()
 
     def clear():
-        DataCollector.driver_data.clear()
-        DataCollector.orders_data.clear()
-        DataCollector.relocation_trip_data.clear()
-        DataCollector.workload.clear()
-        DataCollector.trip_data.clear()
-        DataCollector.time_reduction_quota.clear()
-        DataCollector.zone_id_list.clear()
+        for table in DataCollector.tables():
+            table.discard()
+        DataCollector.last_flush_seconds = 0
@@ -7,7 +7,9 @@ from program.grid.grid import Grid
 from program.interval.time import Time
 from program.interval.time_series import TimeSeries
 from program.logger import LOGGER
+from program.order.order import Order
 from program.order.orders import Orders
+from program.public_transport.closest_station_table import ClosestStationTable
 from program.public_transport.fastest_station_connection_network import FastestStationConnectionNetwork
 from program.state.state import State
 from program.state.state_value_networks import StateValueNetworks
@@ -30,8 +32,10 @@ def execute_graph_reinforcement_learning():
     State.get_state()
     LOGGER.info("Initialize fastest connection network")
     FastestStationConnectionNetwork.get_instance()
+    LOGGER.info("Initialize closest station table")
+    ClosestStationTable.get_instance()
     LOGGER.info("Initialize orders")
-    Orders.get_orders_by_time()
+    Orders.load()
     LOGGER.info("Initialize vehicles")
     Vehicles.get_vehicles()
 
@@ -45,12 +49,11 @@ def execute_graph_reinforcement_learning():
         current_time = Time.of_total_minutes(current_total_minutes)
         LOGGER.info(f"Simulate time {current_time}")
 
-
+        current_total_seconds = current_time.to_total_seconds()
 
         LOGGER.debug(f"Dispatch orders")
-        orders = Orders.get_orders_by_time()[current_time]
-        for order in orders:
-            order.dispatch()
+        orders = Orders.get_orders(current_time)
+        Order.dispatch_all(orders)
         # Add orders to state
         State.get_state().add_orders(orders)
 
@@ -62,7 +65,7 @@ def execute_graph_reinforcement_learning():
 
         # Generate routes
         LOGGER.debug("Generate routes")
-        order_routes_dict = generate_routes(list(State.get_state().orders_dict.values()))
+        order_routes_dict = generate_routes(State.get_state().open_orders.values())
 
         # Generate Action-Driver pairs with all available routes and drivers
         LOGGER.debug("Generate vehicle-action-pairs")
@@ -76,28 +79,31 @@ def execute_graph_reinforcement_learning():
         LOGGER.debug("Apply state-value changes")
         State.get_state().apply_state_change(matches)
 
-        if ProgramParams.FEATURE_RELOCATION_ENABLED and current_time.to_total_seconds() % ProgramParams.MAX_IDLING_TIME == 0:
+        if ProgramParams.FEATURE_RELOCATION_ENABLED and current_total_seconds % ProgramParams.MAX_IDLING_TIME == 0:
             LOGGER.debug("Relocate long time idle vehicles")
             State.get_state().relocate()
         if current_time.to_total_minutes() % 60 == 0:
-            for vehicle in Vehicles.get_vehicles():
+            vehicles = Vehicles.get_vehicles()
+            fleet = Vehicles.get_fleet()
+            cell_ids = Grid.get_instance().find_cells(fleet.lats, fleet.lons)
+            for vehicle, cell_id in zip(vehicles, cell_ids.tolist()):
                 status = (
                     "idling"
                     if not vehicle.is_occupied()
                     else ("relocation" if vehicle.job.is_relocation else "occupied")
                 )
                 DataCollector.append_driver_data(
-                    current_time, vehicle.id, status, vehicle.current_position
-                )
-                DataCollector.append_zone_id(
-                    current_time, Grid.get_instance().find_cell(vehicle.current_position).id
+                    current_total_seconds, vehicle.id, status, vehicle.current_position
                 )
+                DataCollector.append_zone_id(current_total_seconds, cell_id)
 
         # Update the expiry durations of still open orders
         State.get_state().update_order_expiry_duration()
 
+        DataCollector.flush_if_due(current_total_seconds)
+
         # Increment to next interval
-        State.get_state().increment_time_interval(current_time)
+        State.get_state().increment_time_interval(current_total_seconds)
 
     LOGGER.info("Exporting final vehicle positions")
     Vehicles.export_vehicles()
@@ -109,4 +115,4 @@ def execute_graph_reinforcement_learning():
     StateValueNetworks.get_instance().export_weights()
     LOGGER.info(f"Algorithm took {time.time() - start_time} seconds to run.")
 
-    DataCollector.clear()
\ No newline at end of file
+    DataCollector.clear()
@@ -27,14 +27,14 @@ class DeepStateNetwork:
         self.current_state_values_by_action_id = {}
 
     def get_state_value(
-        self, action: Action, zone: Zone, time: Time
+        self, action: Action, zone: Zone, total_seconds: int
     ) -> float:
         from program.state.state import State
         zone_graph = ZoneGraph.get_instance()
 
         state_features = zone_graph.get_feature(zone)
         zone_id = zone.id
-        normalized_time = State.get_state().current_time.to_normalized_time()
+        normalized_time = Time.normalize_total_seconds(State.get_state().current_total_seconds)
         state_embedding = Tensor(
             [
                 state_features.num_orders_now,
@@ -59,6 +59,35 @@ class DeepStateNetwork:
 
         return float(state_value.item())
     
+    # Batched forward pass, returns one state value per zone
+    def get_state_values(self, zones: list[Zone]) -> Tensor:
+        from program.state.state import State
+        zone_graph = ZoneGraph.get_instance()
+
+        normalized_time = Time.normalize_total_seconds(State.get_state().current_total_seconds)
+        state_embeddings = []
+        nodes = []
+        for zone in zones:
+            state_features = zone_graph.get_feature(zone)
+            state_embeddings.append(
+                [
+                    state_features.num_orders_now,
+                    state_features.num_orders_before,
+                    state_features.num_occupied,
+                    state_features.num_idle,
+                    state_features.average_time_reduction,
+                    zone.id,
+                    normalized_time,
+                ]
+            )
+            nodes.append(zone_graph.get_node_id(zone))
+
+        combined_features = torch.cat(
+            [Tensor(state_embeddings), self.current_graph_embedding[nodes]], dim=1
+        )
+
+        return self.dnn(combined_features).squeeze(1)
+
     def calculate_graph_embedding(self, edge_index: tuple[list[int], list[int]], features: list[tuple[int, int, int, int, float]]) -> None:
         edge_index_torch = torch.tensor(edge_index, dtype=torch.long)
         edge_index_torch = to_undirected(edge_index_torch)
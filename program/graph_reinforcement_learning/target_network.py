@@ -1,7 +1,6 @@
 import torch
 from program.action.action import Action
 from program.graph_reinforcement_learning.deep_state_network import DeepStateNetwork
-from program.interval.time import Time
 from program.zone.zone import Zone
 
 
@@ -12,14 +11,35 @@ class TargetNetwork(DeepStateNetwork):
         # Set target networks to eval mode
         self.graph_sage.eval()
         self.dnn.eval()
+
+        self.current_state_value_table: torch.Tensor = None
+        self.current_state_value_list: list[float] = []
+        self.current_row_by_zone_id: dict[int, int] = {}
     
-    def get_state_value(
-        self, action: Action, zone: Zone, time: Time
-    ) -> float:
+    def clear(self) -> None:
+        super(TargetNetwork, self).clear()
+        self.current_state_value_table = None
+        self.current_state_value_list = []
+        self.current_row_by_zone_id = {}
+
+    # The state value only depends on the zone and the current time of the state,
+    # so all zones are evaluated in one forward pass per iteration
+    def calculate_state_value_table(self, zones: list[Zone]) -> None:
         # Prevent backward propagation to effect target network weights
         with torch.no_grad():
-            state_value = super(TargetNetwork, self).get_state_value(action, zone, time)
-        return state_value
+            self.current_state_value_table = self.get_state_values(zones)
+        self.current_state_value_list = self.current_state_value_table.tolist()
+        self.current_row_by_zone_id = {zones[i].id: i for i in range(len(zones))}
+
+    def get_state_value(
+        self, action: Action, zone: Zone, total_seconds: int
+    ) -> float:
+        row = self.current_row_by_zone_id[zone.id]
+
+        # Save the state value for later
+        self.current_state_values_by_action_id[action.id] = self.current_state_value_table[row]
+
+        return self.current_state_value_list[row]
     
     def calculate_graph_embedding(self, edge_index: tuple[list[int], list[int]], features: list[tuple[int, int, int, int, float]]) -> None:
         # Prevent backward propagation to effect target network weights
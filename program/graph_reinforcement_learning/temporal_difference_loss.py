@@ -1,4 +1,3 @@
-import math
 import torch
 import torch.nn as nn
 
@@ -9,17 +8,16 @@ class TemporalDifferenceLoss(nn.Module):
     def __init__(self):
         super(TemporalDifferenceLoss, self).__init__()
 
-    def forward(self, td_values: list[dict]):
-        loss = 0
-        for x in td_values:
-            main_value = x["main_value"]
-            target_value = x["target_value"]
-            discount_value = x["discount_value"]
-            reward = x["reward"]
-            loss += (
-                main_value
-                - reward
-                + discount_value * target_value
-            ) ** 2
+    # All inputs are tensors with one entry per vehicle action pair
+    def forward(
+        self,
+        main_values: torch.Tensor,
+        target_values: torch.Tensor,
+        discount_values: torch.Tensor,
+        rewards: torch.Tensor,
+    ):
+        loss = (
+            (main_values - rewards + discount_values * target_values) ** 2
+        ).sum()
 
         return ProgramParams.LEARNING_RATE * loss
@@ -1,15 +1,21 @@
 from __future__ import annotations
 import csv
+import numpy as np
 from program.grid.grid_cell import GridCell
 from program.location.location import Location
 from program.zone.zone import Zone
 from program.logger import LOGGER
 from program.utils import IdProvider
+from program.world_bundle import WorldBundle
 from program.zone.zones import Zones
 
 
 ID_PROVIDER = IdProvider()
 
+# Shifts raster coordinates slightly upwards, so that cell centers which suffer from
+# float rounding still end up in the bin starting at their own center
+RASTER_EPSILON = 1e-6
+
 
 class Grid:
     _grid = None
@@ -28,20 +34,17 @@ class Grid:
         LOGGER.debug("Starting to create grid cells")
         cells_by_lat_long = {}
 
-        with open("data/grid_cells.csv", mode="r") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                zone_id = int(float(row["zone_id"]))
-                lat = float(row["lat"])
-                long = float(row["long"])
-
-                if lat not in cells_by_lat_long:
-                    cells_by_lat_long[lat] = {}
+        arrays = WorldBundle.get_arrays("grid_cells", Grid.read_arrays)
+        for (zone_id, lat, long) in zip(
+            arrays["zone_ids"].tolist(), arrays["lats"].tolist(), arrays["longs"].tolist()
+        ):
+            if lat not in cells_by_lat_long:
+                cells_by_lat_long[lat] = {}
 
-                cells_by_lat_long[lat][long] = GridCell(
-                    Location(lat, long), self.zones_dict[zone_id]
-                )
-                self.cells_dict[zone_id].append(cells_by_lat_long[lat][long])
+            cells_by_lat_long[lat][long] = GridCell(
+                Location(lat, long), self.zones_dict[zone_id]
+            )
+            self.cells_dict[zone_id].append(cells_by_lat_long[lat][long])
 
         # cells is a two dimensional sorted array sorted by lat in the outer and long in the inner dimension
         self.cells: list[list[GridCell]] = [
@@ -56,54 +59,245 @@ class Grid:
                 self.cells_to_indices[
                     cells_by_lat_long[sorted_lat[i]][sorted_long[j]]
                 ] = (i, j)
+        self.cells_by_id: dict[int, GridCell] = {
+            cell.id: cell for row in self.cells for cell in row
+        }
+        self.build_zone_cells()
         LOGGER.debug("Finished to create grid cells")
 
+        LOGGER.debug("Starting to create grid raster")
+        self.build_raster()
+        LOGGER.debug("Finished to create grid raster")
+
+    # Grid cells in the order of the grid cells file
+    def read_arrays() -> dict[str, np.ndarray]:
+        zone_ids = []
+        lats = []
+        longs = []
+        with open("data/grid_cells.csv", mode="r") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                zone_ids.append(int(float(row["zone_id"])))
+                lats.append(float(row["lat"]))
+                longs.append(float(row["long"]))
+        return {
+            "zone_ids": np.array(zone_ids, dtype=np.int64),
+            "lats": np.array(lats, dtype=np.float64),
+            "longs": np.array(longs, dtype=np.float64),
+        }
+
+    # Cells of each zone in CSR layout indexed by zone id, the cells of zone z are
+    # zone_cell_ids[zone_cell_offsets[z]:zone_cell_offsets[z + 1]] in the order of cells_dict
+    def build_zone_cells(self) -> None:
+        zone_ids = sorted(self.cells_dict)
+        counts = np.zeros(zone_ids[-1] + 1 if len(zone_ids) > 0 else 0, dtype=np.int64)
+        for zone_id in zone_ids:
+            counts[zone_id] = len(self.cells_dict[zone_id])
+        self.zone_cell_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.zone_cell_offsets[1:])
+        self.zone_cell_ids = np.array(
+            [cell.id for zone_id in zone_ids for cell in self.cells_dict[zone_id]],
+            dtype=np.int64,
+        )
+
+    # Picks one cell of each given zone, random numbers in [0, 1) select the cell within the zone
+    def sample_cells(self, zone_ids: np.ndarray, random_numbers: np.ndarray) -> np.ndarray:
+        zone_ids = np.asarray(zone_ids, dtype=np.int64)
+        starts = self.zone_cell_offsets[zone_ids]
+        counts = self.zone_cell_offsets[zone_ids + 1] - starts
+        if np.any(counts == 0):
+            raise Exception(
+                f"No grid cells in zones {sorted(set(zone_ids[counts == 0].tolist()))}"
+            )
+        return self.zone_cell_ids[starts + (random_numbers * counts).astype(np.int64)]
+
     # Find the fitting zone to a coordinate location
     def find_zone(self, location: Location) -> Zone:
         return self.find_cell(location).zone
 
     # Find the fitting cell to a coordinate location
-    # Use two binary searches on lat and long to reduce runtime to O(log(sqrt(n)))
+    # Cell centers and midpoints are read from the point table, other coordinates are
+    # quantized to the raster to read the cell id in O(1)
     def find_cell(self, location: Location) -> GridCell:
+        i = self.point_lat_indices.get(location.lat)
+        j = self.point_lon_indices.get(location.lon)
+        if i != None and j != None:
+            return self.point_cells[i][j]
+        if self.raster_cell_ids is None:
+            return self.search_cell(location.lat, location.lon)
+        x = (location.lat - self.raster_origin_lat) / self.raster_step_lat + RASTER_EPSILON
+        y = (location.lon - self.raster_origin_lon) / self.raster_step_lon + RASTER_EPSILON
+        # On a raster line the binary searches decide, their tie-breaking depends on float rounding
+        if x - int(x) < 2 * RASTER_EPSILON or y - int(y) < 2 * RASTER_EPSILON:
+            return self.search_cell(location.lat, location.lon)
+        i = int(x)
+        j = int(y)
+        i = 0 if i < 0 else (i if i < self.raster_cell_ids.shape[0] else self.raster_cell_ids.shape[0] - 1)
+        j = 0 if j < 0 else (j if j < self.raster_cell_ids.shape[1] else self.raster_cell_ids.shape[1] - 1)
+        return self.cells_by_id[int(self.raster_cell_ids[i, j])]
+
+    # Batch version of find_cell, returns the cell ids for arrays of coordinates
+    def find_cells(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        return self._raster_lookup(lats, lons, self.point_cell_ids, self.raster_cell_ids, lambda cell: cell.id)
+
+    # Batch version of find_zone, returns the zone ids for arrays of coordinates
+    def find_zones(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        return self._raster_lookup(lats, lons, self.point_zone_ids, self.raster_zone_ids, lambda cell: cell.zone.id)
+
+    def _raster_lookup(
+        self, lats: np.ndarray, lons: np.ndarray, point_values: np.ndarray, raster: np.ndarray, value
+    ) -> np.ndarray:
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        values = np.empty(lats.shape, dtype=np.int64)
+
+        # Points of the point table are found by their exact coordinates
+        i = np.minimum(np.searchsorted(self.point_lats, lats), len(self.point_lats) - 1)
+        j = np.minimum(np.searchsorted(self.point_lons, lons), len(self.point_lons) - 1)
+        is_point = (self.point_lats[i] == lats) & (self.point_lons[j] == lons)
+        values[is_point] = point_values[i[is_point], j[is_point]]
+
+        if raster is None:
+            searched = ~is_point
+        else:
+            x = (lats - self.raster_origin_lat) / self.raster_step_lat + RASTER_EPSILON
+            y = (lons - self.raster_origin_lon) / self.raster_step_lon + RASTER_EPSILON
+            i = np.floor(x)
+            j = np.floor(y)
+            on_line = (x - i < 2 * RASTER_EPSILON) | (y - j < 2 * RASTER_EPSILON)
+            i = np.clip(i, 0, raster.shape[0] - 1).astype(np.int64)
+            j = np.clip(j, 0, raster.shape[1] - 1).astype(np.int64)
+            in_raster = ~is_point & ~on_line
+            values[in_raster] = raster[i[in_raster], j[in_raster]]
+            # Only other points on raster lines are left to the binary searches
+            searched = ~is_point & on_line
+        for k in np.flatnonzero(searched).tolist():
+            values[k] = value(self.search_cell(lats[k], lons[k]))
+        return values
+
+    # The raster has half of the cell size as resolution. All decision boundaries of the
+    # binary searches below (cell centers and midpoints between them) lie on raster lines,
+    # so evaluating the searches once per raster bin gives the same cell for every coordinate
+    # in that bin, including the tie-breaking towards non-empty cells.
+    # This only holds if the cell centers lie on a regular lattice, else no raster is built
+    # and all cells are found by the binary searches.
+    def build_raster(self) -> None:
+        lats = sorted(set(row[0].center.lat for row in self.cells))
+        lons = sorted(set(cell.center.lon for row in self.cells for cell in row))
+        self.build_point_table(lats, lons)
+        (self.raster_origin_lat, self.raster_step_lat, lat_bins) = Grid._raster_axis(lats)
+        (self.raster_origin_lon, self.raster_step_lon, lon_bins) = Grid._raster_axis(lons)
+        if not Grid._is_lattice(lats, self.raster_step_lat) or not Grid._is_lattice(lons, self.raster_step_lon):
+            LOGGER.warning("Grid cell centers are not on a regular lattice, cells are found by binary search")
+            self.raster_cell_ids = None
+            self.raster_zone_ids = None
+            return
+
+        bin_lats = [self.raster_origin_lat + (i + 0.5) * self.raster_step_lat for i in range(lat_bins)]
+        bin_lons = [self.raster_origin_lon + (j + 0.5) * self.raster_step_lon for j in range(lon_bins)]
+
+        # The row only depends on the latitude, so the longitude search runs once per row
+        row_cell_ids: dict[int, list[int]] = {}
+        self.raster_cell_ids = np.empty((lat_bins, lon_bins), dtype=np.int64)
+        self.raster_zone_ids = np.empty((lat_bins, lon_bins), dtype=np.int64)
+        for i in range(lat_bins):
+            row = self._search_row(bin_lats[i])
+            if row not in row_cell_ids:
+                row_cell_ids[row] = [
+                    self._search_cell_in_row(self.cells[row], lon).id for lon in bin_lons
+                ]
+            self.raster_cell_ids[i] = row_cell_ids[row]
+            self.raster_zone_ids[i] = [
+                self.cells_by_id[cell_id].zone.id for cell_id in row_cell_ids[row]
+            ]
+
+    # Cells of all points with a center or midpoint latitude and a center or midpoint longitude.
+    # These points lie on raster lines, where the binary searches decide. Orders and idle vehicles
+    # are placed at cell centers, so the searches run once per point here instead of once per lookup.
+    # The table is keyed by the exact coordinates, so it gives the cells of the binary searches.
+    def build_point_table(self, lats: list[float], lons: list[float]) -> None:
+        point_lats = sorted(set(lats + [(lats[k] + lats[k + 1]) / 2 for k in range(len(lats) - 1)]))
+        point_lons = sorted(set(lons + [(lons[k] + lons[k + 1]) / 2 for k in range(len(lons) - 1)]))
+        self.point_lat_indices: dict[float, int] = {point_lats[i]: i for i in range(len(point_lats))}
+        self.point_lon_indices: dict[float, int] = {point_lons[j]: j for j in range(len(point_lons))}
+
+        # The row only depends on the latitude, so the longitude search runs once per row
+        row_cells: dict[int, list[GridCell]] = {}
+        self.point_cells: list[list[GridCell]] = []
+        for lat in point_lats:
+            row = self._search_row(lat)
+            if row not in row_cells:
+                row_cells[row] = [self._search_cell_in_row(self.cells[row], lon) for lon in point_lons]
+            self.point_cells.append(row_cells[row])
+
+        # Same table as arrays for the batch lookups
+        self.point_lats = np.array(point_lats, dtype=np.float64)
+        self.point_lons = np.array(point_lons, dtype=np.float64)
+        self.point_cell_ids = np.array(
+            [[cell.id for cell in row] for row in self.point_cells], dtype=np.int64
+        ).reshape(len(point_lats), len(point_lons))
+        self.point_zone_ids = np.array(
+            [[cell.zone.id for cell in row] for row in self.point_cells], dtype=np.int64
+        ).reshape(len(point_lats), len(point_lons))
+
+    # Returns origin, bin size and amount of bins for one axis of the raster
+    # One extra bin on each side covers all coordinates outside of the grid
+    def _raster_axis(values: list[float]) -> tuple[float, float, int]:
+        if len(values) < 2:
+            return (values[0], 1.0, 1)
+        step = min(values[k + 1] - values[k] for k in range(len(values) - 1)) / 2
+        bins = round((values[-1] - values[0]) / step) + 2
+        return (values[0] - step, step, bins)
+
+    # Every center has to lie a multiple of two bins away from the first one, so that all centers
+    # and midpoints are on raster lines. Deviations below RASTER_EPSILON bins fall into the area
+    # around the raster lines in which the binary searches decide.
+    def _is_lattice(values: list[float], step: float) -> bool:
+        positions = (np.array(values, dtype=np.float64) - values[0]) / (2 * step)
+        return bool(np.all(np.abs(positions - np.round(positions)) * 2 < RASTER_EPSILON))
+
+    # Cell of the binary searches, used without raster and on raster lines
+    def search_cell(self, lat: float, lon: float) -> GridCell:
+        return self._search_cell_in_row(self.cells[self._search_row(lat)], lon)
+
+    # Binary search for the row of the closest latitude
+    def _search_row(self, lat: float) -> int:
         low = 0
         high = len(self.cells) - 1
         mid = 0
 
-        first_selection = []
         # Use binary search for lat
         while low <= high:
             mid = (high + low) // 2
 
             if mid == 0 or mid == len(self.cells) - 1:
-                first_selection = self.cells[mid]
-                break
+                return mid
 
-            if self.cells[mid][0].center.lat < location.lat:
-                if self.cells[mid + 1][0].center.lat >= location.lat:
-                    first_selection = (
-                        self.cells[mid]
-                        if abs(self.cells[mid][0].center.lat - location.lat)
-                        <= abs(self.cells[mid + 1][0].center.lat - location.lat)
-                        else self.cells[mid + 1]
+            if self.cells[mid][0].center.lat < lat:
+                if self.cells[mid + 1][0].center.lat >= lat:
+                    return (
+                        mid
+                        if abs(self.cells[mid][0].center.lat - lat)
+                        <= abs(self.cells[mid + 1][0].center.lat - lat)
+                        else mid + 1
                     )
-                    break
                 else:
                     low = mid + 1
             else:
-                if self.cells[mid - 1][0].center.lat <= location.lat:
-                    first_selection = (
-                        self.cells[mid]
-                        if abs(self.cells[mid][0].center.lat - location.lat)
-                        <= abs(self.cells[mid - 1][0].center.lat - location.lat)
-                        else self.cells[mid - 1]
+                if self.cells[mid - 1][0].center.lat <= lat:
+                    return (
+                        mid
+                        if abs(self.cells[mid][0].center.lat - lat)
+                        <= abs(self.cells[mid - 1][0].center.lat - lat)
+                        else mid - 1
                     )
-                    break
                 else:
                     high = mid - 1
 
-        if len(first_selection) == 0:
-            raise Exception(f"Latitute {location.lat} not in range")
+        raise Exception(f"Latitute {lat} not in range")
 
+    # Binary search for the closest longitude in a row, empty cells lose ties against non-empty ones
+    def _search_cell_in_row(self, first_selection: list[GridCell], lon: float) -> GridCell:
         low = 0
         high = len(first_selection) - 1
         mid = 0
@@ -117,8 +311,8 @@ class Grid:
                 final_cell = first_selection[mid]
                 break
 
-            if first_selection[mid].center.lon < location.lon:
-                if first_selection[mid + 1].center.lon >= location.lon:
+            if first_selection[mid].center.lon < lon:
+                if first_selection[mid + 1].center.lon >= lon:
                     if (
                         first_selection[mid].is_empty()
                         or first_selection[mid + 1].is_empty()
@@ -131,15 +325,15 @@ class Grid:
                         break
                     final_cell = (
                         first_selection[mid]
-                        if abs(first_selection[mid].center.lon - location.lon)
-                        <= abs(first_selection[mid + 1].center.lon - location.lon)
+                        if abs(first_selection[mid].center.lon - lon)
+                        <= abs(first_selection[mid + 1].center.lon - lon)
                         else first_selection[mid + 1]
                     )
                     break
                 else:
                     low = mid + 1
             else:
-                if first_selection[mid - 1].center.lon <= location.lon:
+                if first_selection[mid - 1].center.lon <= lon:
                     if (
                         first_selection[mid].is_empty()
                         or first_selection[mid - 1].is_empty()
@@ -152,8 +346,8 @@ class Grid:
                         break
                     final_cell = (
                         first_selection[mid]
-                        if abs(first_selection[mid].center.lon - location.lon)
-                        <= abs(first_selection[mid - 1].center.lon - location.lon)
+                        if abs(first_selection[mid].center.lon - lon)
+                        <= abs(first_selection[mid - 1].center.lon - lon)
                         else first_selection[mid - 1]
                     )
                     break
@@ -161,7 +355,7 @@ class Grid:
                     high = mid - 1
 
         if final_cell == None:
-            raise Exception(f"Longitude {location.lon} not in range")
+            raise Exception(f"Longitude {lon} not in range")
 
         return final_cell
 
@@ -5,6 +5,8 @@ from program.utils import IdProvider
 ID_PROVIDER = IdProvider()
 
 class GridCell:
+    __slots__ = ("id", "center", "zone")
+
     def __init__(self, center: Location, zone: Zone) -> None:
         self.id = ID_PROVIDER.get_id()
         self.center = center
@@ -2,7 +2,8 @@ from __future__ import annotations
 import math
 
 class Time:
-    
+    __slots__ = ("total_seconds",)
+
     def __init__(self, hour: int, minute: int, second = 0) -> None:
         assert hour >= 0 and hour <= 23
         assert minute >= 0 and minute <= 59
@@ -19,6 +20,12 @@ class Time:
             seconds -= 86400
         return Time(seconds // 3600, (seconds % 3600) // 60, (seconds % 60) // 1)
 
+    # Total seconds within one day, rounded down like of_total_seconds
+    def wrap_total_seconds(seconds: float) -> int:
+        while seconds >= 86400:
+            seconds -= 86400
+        return int(seconds // 1)
+
     # Calculate time difference(distance) in seconds
     def distance_to(self, other: Time) -> int:
         return abs(self.total_seconds - other.total_seconds)
@@ -43,7 +50,10 @@ class Time:
         return self.total_seconds
     
     def to_normalized_time(self) -> float:
-        return math.cos((self.total_seconds / 86400) * 2 * math.pi)
+        return Time.normalize_total_seconds(self.total_seconds)
+
+    def normalize_total_seconds(total_seconds: int) -> float:
+        return math.cos((total_seconds / 86400) * 2 * math.pi)
 
     # in case need to print time
     def __str__(self) -> str:
@@ -17,6 +17,7 @@ class TimeSeries:
     def __init__(self, start: Time, end: Time, intervalLengthInSeconds: int) -> None:
         self.start_time = start
         self.end_time = end
+        self.interval_length = intervalLengthInSeconds
         self.interval_by_id: dict[int, GridInterval] = {}
         self.intervals: list[GridInterval] = []
 
@@ -31,30 +32,13 @@ class TimeSeries:
             self.interval_by_id[interval.id] = interval
             self.intervals.append(interval)
 
-    def find_interval(self, time: Time) -> GridInterval:
-        low = 0
-        high = len(self.intervals) - 1
-        mid = 0
+    # All intervals have the same length, so the interval follows from the seconds since the start
+    def find_interval(self, total_seconds: int) -> GridInterval:
+        index = (total_seconds - self.start_time.to_total_seconds()) // self.interval_length
+        if index < 0 or index >= len(self.intervals):
+            raise Exception(f"Interval to time {Time.of_total_seconds(total_seconds)} not found")
 
-        interval = None
-        while low <= high:
-            mid = (high + low) // 2
-
-            if self.intervals[mid].start.is_before(time):
-                if self.intervals[mid].end.is_after(time):
-                    interval = self.intervals[mid]
-                    break
-                else:
-                    low = mid + 1
-            elif self.intervals[mid].end.is_before(time):
-                low = mid + 1
-            else:
-                high = mid - 1
-
-        if interval == None:
-            raise Exception(f"Interval to time {time} not found")
-
-        return interval
+        return self.intervals[index]
     
     def get_next_interval(self, current_interval: GridInterval) -> GridInterval:
         if len(self.interval_by_id) == current_interval.id + 1:
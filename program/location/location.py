@@ -2,6 +2,8 @@ from __future__ import annotations
 
 # the inputs of lat & lon are in meter
 class Location:
+    __slots__ = ("lat", "lon")
+
     def __init__(self, lat: float, lon: float):
         self.lat = lat
         self.lon = lon
@@ -0,0 +1,54 @@
+from __future__ import annotations
+import math
+from params.program_params import ProgramParams
+from program.order.order import Order
+
+
+# Open orders mapped by id with a ring of expiry buckets, one bucket per simulation update.
+# Expiring orders only touches the orders of the current bucket instead of all open orders.
+class OpenOrders:
+    def __init__(self) -> None:
+        self.orders_dict: dict[int, Order] = {}
+        self.buckets: list[list[int]] = [
+            []
+            for _ in range(
+                math.ceil(ProgramParams.ORDER_EXPIRY_DURATION / ProgramParams.SIMULATION_UPDATE_RATE) + 1
+            )
+        ]
+        # Amount of simulation updates so far
+        self.tick = 0
+
+    def __len__(self) -> int:
+        return len(self.orders_dict)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self.orders_dict
+
+    def __getitem__(self, id: int) -> Order:
+        return self.orders_dict[id]
+
+    # Served orders stay in their bucket and are skipped when it expires
+    def __delitem__(self, id: int) -> None:
+        del self.orders_dict[id]
+
+    def values(self) -> list[Order]:
+        return list(self.orders_dict.values())
+
+    def add(self, order: Order) -> None:
+        # Orders expire in the update their expiry duration has passed
+        updates = max(1, math.ceil(order.expires / ProgramParams.SIMULATION_UPDATE_RATE))
+        if updates >= len(self.buckets):
+            raise Exception(
+                f"Order {order.id} expires after {order.expires} seconds, more than the expiry duration of {ProgramParams.ORDER_EXPIRY_DURATION}"
+            )
+        self.orders_dict[order.id] = order
+        self.buckets[(self.tick + updates) % len(self.buckets)].append(order.id)
+
+    # Deletes all orders expiring in the next simulation update
+    def expire(self) -> None:
+        self.tick += 1
+        bucket = self.tick % len(self.buckets)
+        for id in self.buckets[bucket]:
+            if id in self.orders_dict:
+                del self.orders_dict[id]
+        self.buckets[bucket] = []
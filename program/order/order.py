@@ -1,4 +1,6 @@
 from __future__ import annotations
+from collections import namedtuple
+import numpy as np
 from program.interval.time import Time
 from program.zone.zone import Zone
 from params.program_params import ProgramParams
@@ -7,8 +9,35 @@ from program.location.location import Location
 
 ID_PROVIDER = IdProvider()
 
+# Legs of the combination routes of an order with a vehicle to the origin station, transit and walking
+# from the destination station. One array entry per route, the stations are the network indices of the
+# fastest connection between source and target station.
+RouteCandidates = namedtuple(
+    "RouteCandidates",
+    [
+        "sources",
+        "targets",
+        "vehicle_times",
+        "transit_times",
+        "walking_times",
+        "other_times",
+        "total_times",
+    ],
+)
+
 
 class Order:
+    __slots__ = (
+        "id",
+        "dispatch_time",
+        "start",
+        "end",
+        "zone",
+        "expires",
+        "direct_connection",
+        "route_candidates",
+    )
+
     def __init__(
         self, dispatch_time: Time, start: Location, end: Location, zone: Zone
     ) -> None:
@@ -20,52 +49,125 @@ class Order:
         # Initialized as not dispatched
         self.expires = None
         self.direct_connection = None
+        self.route_candidates = None
 
     def dispatch(self) -> None:
-        self.expires = ProgramParams.ORDER_EXPIRY_DURATION
+        Order.dispatch_all([self])
 
-        # Init fastest connection with walking speed
-        fastest_connection = (
-            [],
-            self.start.distance_to(self.end) / ProgramParams.WALKING_SPEED,
-        )
+    # Dispatches all orders of one minute at once. The fastest connection without any autonomous
+    # on-demand services and the legs of all combination routes are computed as arrays over
+    # (orders, origin lines, destination lines) instead of looping over the station pairs.
+    def dispatch_all(orders: list[Order]) -> None:
+        if len(orders) == 0:
+            return
+
+        from program.public_transport.closest_station_table import ClosestStationTable
         from program.public_transport.fastest_station_connection_network import (
             FastestStationConnectionNetwork,
         )
+        from program.public_transport.station_path import StationPath
 
         fastest_connection_network = FastestStationConnectionNetwork.get_instance()
+        closest_station_table = ClosestStationTable.get_instance()
 
         # 1. Get the closest start and end station for each line
-        from program.public_transport.station import Station
-
-        origins: list[Station] = []
-        destinations: list[Station] = []
-        for line in fastest_connection_network.lines:
-            origins.append(line.get_closest_station(self.start))
-            destinations.append(line.get_closest_station(self.end))
-
-        # 2. Find the most fastest connection without any autonomous on-demand services
-        for origin in origins:
-            for destination in destinations:
-                if origin == destination:
-                    continue
-                connection = fastest_connection_network.get_fastest_connection(
-                    origin, destination
-                )
-                walking_time = (
-                    self.start.distance_to(origin.position)
-                    + destination.position.distance_to(self.end)
-                ) / ProgramParams.WALKING_SPEED
-                # include entry, exit and waiting time
-                other_time = (
-                    2 * ProgramParams.PUBLIC_TRANSPORT_ENTRY_EXIT_TIME
-                    + ProgramParams.PUBLIC_TRANSPORT_WAITING_TIME(self.dispatch_time)
-                )
-                total_additional_time = walking_time + other_time
-                if fastest_connection[1] > total_additional_time + connection[1]:
-                    fastest_connection = (
-                        connection[0],
-                        connection[1] + total_additional_time,
+        (origins, origin_distances) = closest_station_table.get_closest_station_indices(
+            [order.start for order in orders]
+        )
+        (destinations, destination_distances) = (
+            closest_station_table.get_closest_station_indices(
+                [order.end for order in orders]
+            )
+        )
+
+        # 2. Transit times of all origin x destination pairs, both directions of a
+        # station pair use the same connection of the fastest connection network
+        origins = origins[:, :, None]
+        destinations = destinations[:, None, :]
+        sources = fastest_connection_network.get_connection_sources(
+            *np.broadcast_arrays(origins, destinations)
+        )
+        targets = np.where(sources == origins, destinations, origins)
+        transit_times = fastest_connection_network.get_travel_times(sources, targets)
+        is_connection = origins != destinations
+
+        # include entry, exit and waiting time
+        other_times = np.array(
+            [
+                2 * ProgramParams.PUBLIC_TRANSPORT_ENTRY_EXIT_TIME
+                + ProgramParams.PUBLIC_TRANSPORT_WAITING_TIME(order.dispatch_time.to_total_seconds())
+                for order in orders
+            ],
+            dtype=np.float64,
+        )[:, None, None]
+
+        # 3. Find the most fastest connection without any autonomous on-demand services
+        # Orders loaded from the order cache already know it
+        is_precomputed = all(order.direct_connection != None for order in orders)
+        if is_precomputed:
+            direct_connection_times = np.array(
+                [order.direct_connection[1] for order in orders], dtype=np.float64
+            )
+        else:
+            # Init fastest connection with walking speed
+            walking_only_times = np.array(
+                [order.start.distance_to(order.end) for order in orders], dtype=np.float64
+            ) / ProgramParams.WALKING_SPEED
+            total_additional_times = (
+                origin_distances[:, :, None] + destination_distances[:, None, :]
+            ) / ProgramParams.WALKING_SPEED + other_times
+            connection_times = np.where(
+                is_connection, transit_times + total_additional_times, np.inf
+            ).reshape(len(orders), -1)
+            # argmin keeps the first of equally fast connections
+            fastest_pairs = np.argmin(connection_times, axis=1)
+            fastest_times = connection_times[np.arange(len(orders)), fastest_pairs]
+            uses_transit = walking_only_times > fastest_times
+            direct_connection_times = np.where(uses_transit, fastest_times, walking_only_times)
+
+        # 4. Legs of all combination routes
+        # Distance (time in second)
+        vehicle_times = origin_distances[:, :, None] / ProgramParams.VEHICLE_SPEED
+        walking_times = destination_distances[:, None, :] / ProgramParams.WALKING_SPEED
+        total_times = vehicle_times + walking_times + transit_times + other_times
+        # Since we want people to use public transport, here we check against the direct_connection without any bus
+        is_candidate = (
+            is_connection
+            & (direct_connection_times > ProgramParams.L1)[:, None, None]
+            & (total_times < (direct_connection_times + ProgramParams.L2)[:, None, None])
+        )
+
+        vehicle_times = np.broadcast_to(vehicle_times, total_times.shape)
+        walking_times = np.broadcast_to(walking_times, total_times.shape)
+        other_times = np.broadcast_to(other_times, total_times.shape)
+        flat_sources = sources.reshape(len(orders), -1)
+        flat_targets = targets.reshape(len(orders), -1)
+        for i in range(len(orders)):
+            order = orders[i]
+            order.expires = ProgramParams.ORDER_EXPIRY_DURATION
+            if not is_precomputed:
+                if uses_transit[i]:
+                    pair = int(fastest_pairs[i])
+                    order.direct_connection = (
+                        StationPath(
+                            fastest_connection_network,
+                            int(flat_sources[i][pair]),
+                            int(flat_targets[i][pair]),
+                        ),
+                        float(direct_connection_times[i]),
                     )
+                else:
+                    order.direct_connection = ([], float(direct_connection_times[i]))
 
-        self.direct_connection: tuple[list[Station], float] = fastest_connection
+            # Combination routes only depend on the order itself, so their legs are computed once here
+            # and the routes are created from them by the route generation until the order expires or is served.
+            (a, b) = np.nonzero(is_candidate[i])
+            order.route_candidates = RouteCandidates(
+                sources[i, a, b],
+                targets[i, a, b],
+                vehicle_times[i, a, b],
+                transit_times[i, a, b],
+                walking_times[i, a, b],
+                other_times[i, a, b],
+                total_times[i, a, b],
+            )
@@ -1,44 +1,282 @@
 import csv
-import random
+import hashlib
+import os
+import numpy as np
 from params.program_params import ProgramParams
 from program.grid.grid import Grid
 from program.interval.time import Time
 from program.logger import LOGGER
 from program.order.order import Order
 
+# One time object per minute shared by all orders of this minute
+TIMES = [Time(hour, minute) for hour in range(24) for minute in range(60)]
 
+# One record per order of a day, sorted by minute. Orders are placed at cell centers, so the cells
+# and zones are stored by id. The direct connection is stored by its network indices, -1 means walking.
+ORDER_CACHE_DTYPE = np.dtype(
+    [
+        ("minute", np.int16),
+        ("start_cell_id", np.int32),
+        ("end_cell_id", np.int32),
+        ("start_zone_id", np.int32),
+        ("end_zone_id", np.int32),
+        ("direct_connection_time", np.float64),
+        ("direct_connection_source", np.int32),
+        ("direct_connection_target", np.int32),
+    ]
+)
+
+# Parameters the records of an order cache were created with, stored in front of the records.
+# The cell ids and station indices refer to the grid cells and stations of the world fingerprint.
+# The cells depend on the sampling seed, the direct connection times on the walking speed,
+# the entry and exit time and the waiting time of each minute.
+ORDER_CACHE_PARAMETERS_DTYPE = np.dtype(
+    [
+        ("world_fingerprint", "S64"),
+        ("order_sampling_seed", np.int64),
+        ("walking_speed", np.float64),
+        ("public_transport_entry_exit_time", np.float64),
+        ("public_transport_waiting_times", np.float64, (len(TIMES),)),
+    ]
+)
+
+
+# Streams the orders of one day minute by minute. The day is kept as compact records, memory mapped
+# from the order cache or read from the orders file, and order objects only exist for the minutes
+# of the read-ahead window. Orders of past minutes are dropped from the stream.
 class Orders:
-    _orders_by_time: dict[Time, list[Order]] = None
+    _records: np.ndarray = None
+    # Records of minute m are _records[_minute_bounds[m]:_minute_bounds[m + 1]]
+    _minute_bounds: list[int] = None
+    _has_direct_connections = False
+    _orders_by_minute: dict[int, list[Order]] = {}
 
     # Resets the orders
     def reset() -> None:
-        Orders._orders_by_time = None
-
-    def get_orders_by_time() -> dict[Time, list[Order]]:
-        if Orders._orders_by_time == None:
-            Orders._orders_by_time = {
-                Time(hour, minute): [] for minute in range(60) for hour in range(24)
-            }
-            with open(ProgramParams.ORDERS_FILE_PATH(), mode="r") as file:
-                reader = csv.DictReader(file)
-                for i, row in enumerate(reader):
-                    if i % 50000 == 0:
-                        LOGGER.debug(f"Processed {(i // 50000)*50000} orders...")
-                    # Extract hour and minute from the pickup datetime
-                    hour = int(row["pickup_time"][0:2])
-                    minute = int(row["pickup_time"][3:5])
-                    # Create a tuple of Pickup and Dropoff Zone IDs
-                    pu_zone_id = int(row["PULocationID"])
-                    do_zone_id = int(row["DOLocationID"])
-                    order = Order(
-                        Time(hour, minute),
-                        random.Random(i)
-                        .choice(Grid.get_instance().cells_dict[pu_zone_id])
-                        .center,
-                        random.Random(i + 1)
-                        .choice(Grid.get_instance().cells_dict[do_zone_id])
-                        .center,
-                        Grid.get_instance().zones_dict[pu_zone_id],
-                    )
-                    Orders._orders_by_time[Time(hour, minute)].append(order)
-        return Orders._orders_by_time
\ No newline at end of file
+        Orders._records = None
+        Orders._minute_bounds = None
+        Orders._has_direct_connections = False
+        Orders._orders_by_minute = {}
+
+    def load() -> None:
+        if Orders._minute_bounds != None:
+            return
+        if os.path.isfile(ProgramParams.ORDERS_CACHE_FILE_PATH()):
+            LOGGER.debug("Starting to load orders from cache")
+            Orders.set_records(Orders.load_cache(ProgramParams.ORDERS_CACHE_FILE_PATH()), True)
+            LOGGER.debug("Finished to load orders from cache")
+        else:
+            LOGGER.debug("Starting to read orders")
+            Orders.set_records(Orders.read_records(), False)
+            LOGGER.debug("Finished to read orders")
+
+    # Parameters of the current program params in the format of the order cache
+    def cache_parameters() -> np.ndarray:
+        parameters = np.zeros(1, dtype=ORDER_CACHE_PARAMETERS_DTYPE)
+        parameters["world_fingerprint"] = Orders.world_fingerprint()
+        parameters["order_sampling_seed"] = ProgramParams.ORDER_SAMPLING_SEED
+        parameters["walking_speed"] = ProgramParams.WALKING_SPEED
+        parameters["public_transport_entry_exit_time"] = ProgramParams.PUBLIC_TRANSPORT_ENTRY_EXIT_TIME
+        parameters["public_transport_waiting_times"] = [
+            ProgramParams.PUBLIC_TRANSPORT_WAITING_TIME(time.to_total_seconds()) for time in TIMES
+        ]
+        return parameters
+
+    # Hash of the grid cells by id and the stations by network index
+    def world_fingerprint() -> str:
+        from program.public_transport.fastest_station_connection_network import (
+            FastestStationConnectionNetwork,
+        )
+
+        digest = hashlib.sha256()
+        cells = sorted(Grid.get_instance().cells_by_id.values(), key=lambda cell: cell.id)
+        digest.update(
+            np.array(
+                [(cell.id, cell.zone.id, cell.center.lat, cell.center.lon) for cell in cells],
+                dtype=np.float64,
+            ).tobytes()
+        )
+        digest.update(
+            np.array(
+                [
+                    (station.id, station.position.lat, station.position.lon)
+                    for station in FastestStationConnectionNetwork.get_instance().stations
+                ],
+                dtype=np.float64,
+            ).tobytes()
+        )
+        return digest.hexdigest()
+
+    # The cache file holds two .npy arrays, the parameters and the records. Only the records are memory mapped.
+    def load_cache(path: str) -> np.ndarray:
+        with open(path, mode="rb") as file:
+            parameters = np.load(file)
+            if parameters.dtype != ORDER_CACHE_PARAMETERS_DTYPE:
+                raise Exception(f"Order cache {path} has an unknown format, please recreate it")
+            version = np.lib.format.read_magic(file)
+            (shape, _, dtype) = (
+                np.lib.format.read_array_header_1_0(file)
+                if version == (1, 0)
+                else np.lib.format.read_array_header_2_0(file)
+            )
+            offset = file.tell()
+        if dtype != ORDER_CACHE_DTYPE:
+            raise Exception(f"Order cache {path} has an unknown format, please recreate it")
+
+        expected = Orders.cache_parameters()
+        different = [
+            name
+            for name in ORDER_CACHE_PARAMETERS_DTYPE.names
+            if not np.array_equal(parameters[name], expected[name])
+        ]
+        if len(different) > 0:
+            raise Exception(
+                f"Order cache {path} was created with other values of {', '.join(different)}, please recreate it"
+            )
+        # An empty array cannot be memory mapped
+        if shape[0] == 0:
+            return np.zeros(0, dtype=ORDER_CACHE_DTYPE)
+        return np.memmap(path, dtype=ORDER_CACHE_DTYPE, mode="r", offset=offset, shape=shape)
+
+    def save_cache(path: str, records: np.ndarray) -> None:
+        with open(path, mode="wb") as file:
+            np.save(file, Orders.cache_parameters())
+            np.save(file, records)
+
+    def set_records(records: np.ndarray, has_direct_connections: bool) -> None:
+        Orders._records = records
+        Orders._minute_bounds = np.searchsorted(
+            records["minute"], np.arange(len(TIMES) + 1)
+        ).tolist()
+        Orders._has_direct_connections = has_direct_connections
+        Orders._orders_by_minute = {}
+
+    # Amount of orders per start zone id of the given minute, read from the records without creating the orders
+    def get_zone_counts(time: Time) -> np.ndarray:
+        Orders.load()
+        minute = time.to_total_minutes()
+        records = Orders._records[Orders._minute_bounds[minute]:Orders._minute_bounds[minute + 1]]
+        return np.bincount(records["start_zone_id"])
+
+    def get_orders(time: Time) -> list[Order]:
+        Orders.load()
+        minute = time.to_total_minutes()
+        if minute not in Orders._orders_by_minute:
+            # The requested minute is always read, also without read ahead
+            read_ahead_minutes = max(1, ProgramParams.ORDER_READ_AHEAD_MINUTES)
+            for read_minute in range(minute, min(minute + read_ahead_minutes, len(TIMES))):
+                if read_minute not in Orders._orders_by_minute:
+                    Orders._orders_by_minute[read_minute] = Orders.create_orders(read_minute)
+        for past_minute in [m for m in Orders._orders_by_minute if m < minute]:
+            del Orders._orders_by_minute[past_minute]
+        return Orders._orders_by_minute[minute]
+
+    # Orders of the cache already carry their direct connection, so dispatching them only computes the combination routes
+    def create_orders(minute: int) -> list[Order]:
+        from program.public_transport.fastest_station_connection_network import (
+            FastestStationConnectionNetwork,
+        )
+        from program.public_transport.station_path import StationPath
+
+        grid = Grid.get_instance()
+        records = Orders._records[Orders._minute_bounds[minute]:Orders._minute_bounds[minute + 1]]
+        orders = []
+        for (start_cell_id, end_cell_id, zone_id) in zip(
+            records["start_cell_id"].tolist(),
+            records["end_cell_id"].tolist(),
+            records["start_zone_id"].tolist(),
+        ):
+            if start_cell_id not in grid.cells_by_id or end_cell_id not in grid.cells_by_id:
+                raise Exception(
+                    f"Order cache {ProgramParams.ORDERS_CACHE_FILE_PATH()} does not match the grid cells, please recreate it"
+                )
+            orders.append(
+                Order(
+                    TIMES[minute],
+                    grid.cells_by_id[start_cell_id].center,
+                    grid.cells_by_id[end_cell_id].center,
+                    grid.zones_dict[zone_id],
+                )
+            )
+
+        if Orders._has_direct_connections:
+            network = FastestStationConnectionNetwork.get_instance()
+            for (order, time, source, target) in zip(
+                orders,
+                records["direct_connection_time"].tolist(),
+                records["direct_connection_source"].tolist(),
+                records["direct_connection_target"].tolist(),
+            ):
+                order.direct_connection = (
+                    StationPath(network, source, target) if source >= 0 else [],
+                    time,
+                )
+        return orders
+
+    # Seed scheme of the cell sampling: one seed sequence per day from ORDER_SAMPLING_SEED and the
+    # simulation date, spawning one stream for the start and one for the end cells. The order in row i
+    # of the orders file uses the i-th random number of both streams, independent of the other orders.
+    def cell_sampling_generators() -> tuple[np.random.Generator, np.random.Generator]:
+        seed_sequence = np.random.SeedSequence(
+            [ProgramParams.ORDER_SAMPLING_SEED, ProgramParams.SIMULATION_DATE.toordinal()]
+        )
+        (start_seed, end_seed) = seed_sequence.spawn(2)
+        return (np.random.default_rng(start_seed), np.random.default_rng(end_seed))
+
+    # Reads the orders file into records sorted by minute, without direct connections
+    def read_records() -> np.ndarray:
+        minutes = []
+        pu_zone_ids = []
+        do_zone_ids = []
+        with open(ProgramParams.ORDERS_FILE_PATH(), mode="r") as file:
+            reader = csv.DictReader(file)
+            for i, row in enumerate(reader):
+                if i % 50000 == 0:
+                    LOGGER.debug(f"Processed {(i // 50000)*50000} orders...")
+                # Extract hour and minute from the pickup datetime
+                minutes.append(int(row["pickup_time"][0:2]) * 60 + int(row["pickup_time"][3:5]))
+                # Pickup and Dropoff Zone IDs
+                pu_zone_ids.append(int(row["PULocationID"]))
+                do_zone_ids.append(int(row["DOLocationID"]))
+
+        grid = Grid.get_instance()
+        (start_generator, end_generator) = Orders.cell_sampling_generators()
+        minutes = np.array(minutes, dtype=np.int64)
+        pu_zone_ids = np.array(pu_zone_ids, dtype=np.int64)
+        do_zone_ids = np.array(do_zone_ids, dtype=np.int64)
+        start_cell_ids = grid.sample_cells(pu_zone_ids, start_generator.random(len(pu_zone_ids)))
+        end_cell_ids = grid.sample_cells(do_zone_ids, end_generator.random(len(do_zone_ids)))
+
+        # Stable sort keeps the file order within each minute
+        order = np.argsort(minutes, kind="stable")
+        records = np.zeros(len(minutes), dtype=ORDER_CACHE_DTYPE)
+        records["minute"] = minutes[order]
+        records["start_cell_id"] = start_cell_ids[order]
+        records["end_cell_id"] = end_cell_ids[order]
+        records["start_zone_id"] = pu_zone_ids[order]
+        records["end_zone_id"] = do_zone_ids[order]
+        return records
+
+    # Needs to be recreated after changes to the orders file or the public transport graph. Changes of
+    # the grid cells, stations and other parameters in ORDER_CACHE_PARAMETERS_DTYPE are detected when loading the cache.
+    def create_cache() -> None:
+        records = Orders.read_records()
+        Orders.set_records(records, False)
+
+        # Direct connections are computed by dispatching the orders of each minute
+        for minute in range(len(TIMES)):
+            start = Orders._minute_bounds[minute]
+            orders = Orders.create_orders(minute)
+            Order.dispatch_all(orders)
+            for i in range(len(orders)):
+                (stations, time) = orders[i].direct_connection
+                records["direct_connection_time"][start + i] = time
+                if isinstance(stations, list):
+                    records["direct_connection_source"][start + i] = -1
+                    records["direct_connection_target"][start + i] = -1
+                else:
+                    records["direct_connection_source"][start + i] = stations.source_index
+                    records["direct_connection_target"][start + i] = stations.target_index
+
+        Orders.save_cache(ProgramParams.ORDERS_CACHE_FILE_PATH(), records)
+        Orders.reset()
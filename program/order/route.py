@@ -11,6 +11,22 @@ ID_PROVIDER = IdProvider()
 
 # Class route contains data model of route object
 class Route:
+    __slots__ = (
+        "id",
+        "order",
+        "origin",
+        "destination",
+        "stations",
+        "transit_time",
+        "walking_time",
+        "other_time",
+        "total_time",
+        "vehicle_time",
+        "vehicle_destination",
+        "vehicle_destination_cell",
+        "time_reduction",
+    )
+
     def __init__(
         self,
         order: Order,
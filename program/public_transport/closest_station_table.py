@@ -0,0 +1,191 @@
+from __future__ import annotations
+import csv
+import hashlib
+import os
+import numpy as np
+from program.grid.grid import Grid
+from program.location.location import Location
+from program.logger import LOGGER
+
+CLOSEST_STATIONS_FILE_PATH = "data/closest_stations.csv"
+
+
+# Singleton class containing the closest station of each line for each grid cell center
+# Orders are always placed at cell centers, so closest stations become a table lookup
+# The first line of the file holds the fingerprint of the grid cells and stations the table was created for,
+# a table of other grid cells or stations is created again
+class ClosestStationTable:
+    _closest_station_table: ClosestStationTable = None
+
+    def get_instance() -> ClosestStationTable:
+        if ClosestStationTable._closest_station_table == None:
+            if (
+                os.path.isfile(CLOSEST_STATIONS_FILE_PATH)
+                and ClosestStationTable.read_fingerprint() == ClosestStationTable.fingerprint()
+            ):
+                LOGGER.debug("Starting to load closest station table")
+                ClosestStationTable._closest_station_table = ClosestStationTable.load()
+                LOGGER.debug("Finished to load closest station table")
+            else:
+                LOGGER.debug("Starting to create closest station table")
+                ClosestStationTable._closest_station_table = ClosestStationTable.create()
+                ClosestStationTable._closest_station_table.export()
+                LOGGER.debug("Finished to create closest station table")
+        return ClosestStationTable._closest_station_table
+
+    def __init__(
+        self,
+        station_ids: np.ndarray,
+        distances: np.ndarray,
+        centers: list[tuple[float, float]],
+    ) -> None:
+        from program.public_transport.fastest_station_connection_network import (
+            FastestStationConnectionNetwork,
+        )
+
+        network = FastestStationConnectionNetwork.get_instance()
+        self.lines = network.lines
+        self.index_by_station_id = network.index_by_station_id
+
+        # Rows are grid cells, columns are lines in the order of the fastest connection network
+        self.station_ids = station_ids
+        self.distances = distances
+        self.centers = centers
+        self.row_by_center: dict[tuple[float, float], int] = {
+            centers[i]: i for i in range(len(centers))
+        }
+        # Same table with indices of the stations in the fastest connection network
+        self.station_indices = np.array(
+            [
+                [network.index_by_station_id[station_id] for station_id in row]
+                for row in station_ids.tolist()
+            ],
+            dtype=np.int64,
+        ).reshape(station_ids.shape)
+
+    # Returns the network indices and distances of the closest station of each line for each location
+    # as two arrays of shape (locations, lines)
+    def get_closest_station_indices(
+        self, locations: list[Location]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        rows = [self.row_by_center.get((location.lat, location.lon)) for location in locations]
+        if None not in rows:
+            return (self.station_indices[rows], self.distances[rows])
+
+        station_indices = np.empty((len(locations), len(self.lines)), dtype=np.int64)
+        distances = np.empty((len(locations), len(self.lines)), dtype=np.float64)
+        for i in range(len(locations)):
+            if rows[i] != None:
+                station_indices[i] = self.station_indices[rows[i]]
+                distances[i] = self.distances[rows[i]]
+                continue
+            for k in range(len(self.lines)):
+                station = self.lines[k].get_closest_station(locations[i])
+                station_indices[i][k] = self.index_by_station_id[station.id]
+                distances[i][k] = station.position.distance_to(locations[i])
+        return (station_indices, distances)
+
+    def create() -> ClosestStationTable:
+        from program.public_transport.fastest_station_connection_network import (
+            FastestStationConnectionNetwork,
+        )
+
+        cells = [cell for row in Grid.get_instance().cells for cell in row]
+        lines = FastestStationConnectionNetwork.get_instance().lines
+        cell_lats = np.array([cell.center.lat for cell in cells])
+        cell_lons = np.array([cell.center.lon for cell in cells])
+
+        station_ids = np.empty((len(cells), len(lines)), dtype=np.int64)
+        distances = np.empty((len(cells), len(lines)), dtype=np.float64)
+        for k in range(len(lines)):
+            station_lats = np.array([station.position.lat for station in lines[k].stations])
+            station_lons = np.array([station.position.lon for station in lines[k].stations])
+            # Same formula as Location.distance_to, argmin keeps the first station on ties like Line.get_closest_station
+            line_distances = (
+                111.3 * np.abs(station_lats[None, :] - cell_lats[:, None])
+                + 71.5 * np.abs(station_lons[None, :] - cell_lons[:, None])
+            ) * 1000
+            closest = np.argmin(line_distances, axis=1)
+            station_ids[:, k] = [lines[k].stations[i].id for i in closest.tolist()]
+            distances[:, k] = line_distances[np.arange(len(cells)), closest]
+
+        return ClosestStationTable(
+            station_ids,
+            distances,
+            [(cell.center.lat, cell.center.lon) for cell in cells],
+        )
+
+    # Hash of the grid cell centers and the stations of each line in the order of the fastest connection network
+    def fingerprint() -> str:
+        from program.public_transport.fastest_station_connection_network import (
+            FastestStationConnectionNetwork,
+        )
+
+        digest = hashlib.sha256()
+        centers = [(cell.center.lat, cell.center.lon) for row in Grid.get_instance().cells for cell in row]
+        digest.update(np.array(centers, dtype=np.float64).tobytes())
+        for line in FastestStationConnectionNetwork.get_instance().lines:
+            digest.update(line.name.encode("utf-8"))
+            digest.update(
+                np.array(
+                    [(station.id, station.position.lat, station.position.lon) for station in line.stations],
+                    dtype=np.float64,
+                ).tobytes()
+            )
+        return digest.hexdigest()
+
+    # Returns None for files without fingerprint
+    def read_fingerprint() -> str:
+        with open(CLOSEST_STATIONS_FILE_PATH, mode="r") as file:
+            row = next(csv.reader(file), [])
+        return row[1] if len(row) == 2 and row[0] == "fingerprint" else None
+
+    def load() -> ClosestStationTable:
+        from program.public_transport.fastest_station_connection_network import (
+            FastestStationConnectionNetwork,
+        )
+
+        lines = FastestStationConnectionNetwork.get_instance().lines
+        column_by_line_name = {lines[k].name: k for k in range(len(lines))}
+
+        row_by_center: dict[tuple[float, float], int] = {}
+        station_ids: list[list[int]] = []
+        distances: list[list[float]] = []
+        with open(CLOSEST_STATIONS_FILE_PATH, mode="r") as file:
+            # Skip the fingerprint
+            file.readline()
+            reader = csv.DictReader(file)
+            for row in reader:
+                center = (float(row["cell_lat"]), float(row["cell_long"]))
+                if center not in row_by_center:
+                    row_by_center[center] = len(station_ids)
+                    station_ids.append([0 for _ in lines])
+                    distances.append([0.0 for _ in lines])
+                column = column_by_line_name[row["line"]]
+                station_ids[row_by_center[center]][column] = int(row["station_id"])
+                distances[row_by_center[center]][column] = float(row["distance"])
+
+        return ClosestStationTable(
+            np.array(station_ids, dtype=np.int64),
+            np.array(distances, dtype=np.float64),
+            list(row_by_center),
+        )
+
+    def export(self) -> None:
+        station_ids = self.station_ids.tolist()
+        distances = self.distances.tolist()
+        with open(CLOSEST_STATIONS_FILE_PATH, mode="w") as file:
+            writer = csv.writer(file)
+            writer.writerow(["fingerprint", ClosestStationTable.fingerprint()])
+            writer.writerow(["cell_lat", "cell_long", "line", "station_id", "distance"])
+            for row in range(len(self.centers)):
+                for k in range(len(self.lines)):
+                    writer.writerow(
+                        [
+                            self.centers[row][0],
+                            self.centers[row][1],
+                            self.lines[k].name,
+                            station_ids[row][k],
+                            distances[row][k],
+                        ]
+                    )
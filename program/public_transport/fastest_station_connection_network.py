@@ -1,8 +1,11 @@
 from __future__ import annotations
 import csv
+import numpy as np
+from params.program_params import ProgramParams, TransitRouting
 from program.location.location import Location
 from program.logger import LOGGER
 from program.public_transport.station import Station
+from program.world_bundle import WorldBundle
 
 # Singleton class containing the global fastest station connections
 class FastestStationConnectionNetwork:
@@ -10,67 +13,148 @@ class FastestStationConnectionNetwork:
 
     def get_instance():
         if FastestStationConnectionNetwork._connection_network == None:
-            LOGGER.debug("Starting to create fastest connection network")
-
-            line_id_to_station_id: dict[int, list[int]] = {}
-            id_to_station_dict: dict[int, Station] = {}
-
-            with open("data/continuous_subway_data.csv", mode="r") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    line_id = row["line"]
-                    station_name = row["station_name"]
-                    lat = float(row["LAT"])
-                    long = float(row["LONG"])
-                    station_id = int(row["ID"])
-
-                    if station_id not in id_to_station_dict:
-                        id_to_station_dict[station_id] = Station(station_id, Location(lat, long), station_name)
-                    if line_id not in line_id_to_station_id:
-                        line_id_to_station_id[line_id] = []
-                    line_id_to_station_id[line_id].append(station_id)
-            
-            from program.public_transport.line import Line
-            lines = []
-            for line_id in line_id_to_station_id:
-                lines.append(Line(list(map(lambda station_id: id_to_station_dict[station_id], line_id_to_station_id[line_id])), line_id))
-            stations = list(sorted(id_to_station_dict.values(), key=lambda x: x.id))
-
-            fastest_connections: list[tuple[int, int, list[Station], float]] = []
-
-            with open("data/shortest_paths.csv", mode="r") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    start_id = int(row["start_station"])
-                    end_id = int(row["end_station"])
-                    connections = list(map(lambda x: id_to_station_dict[int(x)], row["connection"].split(" -> ")[0].strip("][").split(", ")))
-                    travel_time = float(row["connection"].split(" -> ")[1])
-                    fastest_connections.append((start_id, end_id, connections, travel_time))
-
-            FastestStationConnectionNetwork._connection_network = FastestStationConnectionNetwork(fastest_connections, stations, lines)
-            LOGGER.debug("Finished to create fastest connection network")
+            if ProgramParams.TRANSIT_ROUTING == TransitRouting.ROUTER:
+                from program.public_transport.transit_router import TransitRouter
+
+                LOGGER.debug("Starting to create transit router")
+                FastestStationConnectionNetwork._connection_network = TransitRouter.create()
+                LOGGER.debug("Finished to create transit router")
+            else:
+                LOGGER.debug("Starting to create fastest connection network")
+                FastestStationConnectionNetwork._connection_network = FastestStationConnectionNetwork.load()
+                LOGGER.debug("Finished to create fastest connection network")
 
         return FastestStationConnectionNetwork._connection_network
 
-    def __init__(self, fastest_connections: list[tuple[Station, Station, list[Station], float]], stations: list[Station], lines) -> None:
+    # Returns: tuple[Stations sorted by id, lines]
+    # Uses the given station arrays, else the arrays of the world bundle or the subway data file
+    def read_stations(arrays: dict[str, np.ndarray] = None) -> tuple[list[Station], list]:
+        line_id_to_station_id: dict[int, list[int]] = {}
+        id_to_station_dict: dict[int, Station] = {}
+
+        if arrays == None:
+            arrays = WorldBundle.get_arrays("stations", FastestStationConnectionNetwork.read_station_arrays)
+        for (line_id, station_name, lat, long, station_id) in zip(
+            arrays["lines"].tolist(),
+            arrays["station_names"].tolist(),
+            arrays["lats"].tolist(),
+            arrays["longs"].tolist(),
+            arrays["ids"].tolist(),
+        ):
+            if station_id not in id_to_station_dict:
+                id_to_station_dict[station_id] = Station(station_id, Location(lat, long), station_name)
+            if line_id not in line_id_to_station_id:
+                line_id_to_station_id[line_id] = []
+            line_id_to_station_id[line_id].append(station_id)
+
+        from program.public_transport.line import Line
+        lines = []
+        for line_id in line_id_to_station_id:
+            lines.append(Line(list(map(lambda station_id: id_to_station_dict[station_id], line_id_to_station_id[line_id])), line_id))
+        stations = list(sorted(id_to_station_dict.values(), key=lambda x: x.id))
+        return (stations, lines)
+
+    # Rows of the subway data file in the order of the file
+    def read_station_arrays() -> dict[str, np.ndarray]:
+        lines = []
+        station_names = []
+        lats = []
+        longs = []
+        ids = []
+        with open("data/continuous_subway_data.csv", mode="r") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                lines.append(row["line"])
+                station_names.append(row["station_name"])
+                lats.append(float(row["LAT"]))
+                longs.append(float(row["LONG"]))
+                ids.append(int(row["ID"]))
+        return {
+            "lines": np.array(lines, dtype=str),
+            "station_names": np.array(station_names, dtype=str),
+            "lats": np.array(lats, dtype=np.float64),
+            "longs": np.array(longs, dtype=np.float64),
+            "ids": np.array(ids, dtype=np.int64),
+        }
+
+    def load() -> FastestStationConnectionNetwork:
+        (stations, lines) = FastestStationConnectionNetwork.read_stations()
+        arrays = WorldBundle.get_arrays(
+            "shortest_paths", lambda: FastestStationConnectionNetwork.read_connection_arrays(stations)
+        )
+        if arrays["travel_times"].shape != (len(stations), len(stations)):
+            raise Exception("Fastest connections do not match the stations, please recreate the world bundle")
+        return FastestStationConnectionNetwork(
+            arrays["travel_times"], arrays["predecessors"], arrays["connection_sources"], stations, lines
+        )
+
+    # Station x station matrices of the shortest paths file, see __init__
+    def read_connection_arrays(stations: list[Station]) -> dict[str, np.ndarray]:
+        # Stations are indexed in the order of their ids
+        index_by_station_id = {stations[i].id: i for i in range(len(stations))}
+        # Station indices fit into int16 for up to 32767 stations
+        index_dtype = np.int16 if len(stations) <= np.iinfo(np.int16).max else np.int32
+        travel_times = np.full((len(stations), len(stations)), np.inf, dtype=np.float32)
+        predecessors = np.full((len(stations), len(stations)), -1, dtype=index_dtype)
+        connection_sources = np.full((len(stations), len(stations)), -1, dtype=index_dtype)
+
+        with open("data/shortest_paths.csv", mode="r") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                start_index = index_by_station_id[int(row["start_station"])]
+                end_index = index_by_station_id[int(row["end_station"])]
+                (path, travel_time) = row["connection"].split(" -> ")
+                path_ids = path.strip("][").rsplit(", ", 2)
+                # Unreachable stations are written as "[end] -> inf", they keep no connection
+                if len(path_ids) < 2:
+                    continue
+                # Only the station before the end is needed, the rest of the path follows
+                # from the predecessors of the same start station
+                predecessor_id = int(path_ids[-2])
+                travel_times[start_index, end_index] = float(travel_time)
+                predecessors[start_index, end_index] = index_by_station_id[predecessor_id]
+                # A station pair uses the connection of the row that comes last in the file
+                connection_sources[min(start_index, end_index), max(start_index, end_index)] = start_index
+
+        return {
+            "travel_times": travel_times,
+            "predecessors": predecessors,
+            "connection_sources": connection_sources,
+        }
+
+    def __init__(self, travel_times: np.ndarray, predecessors: np.ndarray, connection_sources: np.ndarray, stations: list[Station], lines) -> None:
 
         from program.public_transport.line import Line
         self.lines: list[Line] = lines
         self.stations = stations
-
-        self.connection_network: dict[int, dict[int, tuple[list[Station], float]]] = {}
-        for connection in fastest_connections:
-            start_id = connection[0] if connection[0] <= connection[1] else connection[1]
-            end_id = connection[1] if connection[0] <= connection[1] else connection[0]
-
-            if start_id not in self.connection_network:
-                self.connection_network[start_id] = {}
-
-            self.connection_network[start_id][end_id] = (connection[2], connection[3])
-
-    # Returns: tuple[List of stations, transit time]
-    def get_fastest_connection(self, start: Station, end: Station) -> tuple[list[Station], float]:
-        start_id = start.id if start.id <= end.id else end.id
-        end_id = end.id if start.id <= end.id else start.id
-
-        return self.connection_network[start_id][end_id]
\ No newline at end of file
+        self.index_by_station_id: dict[int, int] = {stations[i].id: i for i in range(len(stations))}
+
+        # Dense station x station matrices, stations are indexed in the order of their ids
+        # travel_times[i][j]: transit time from station i to station j
+        # predecessors[i][j]: station before j on the fastest connection from i to j
+        # connection_sources[i][j] with i < j: start station of the connection used for this pair
+        # Station pairs without connection have the travel time inf and -1 as predecessor and connection source
+        self.travel_times = travel_times
+        self.predecessors = predecessors
+        self.connection_sources = connection_sources
+
+    # Start station indices of the connections used for the station pairs of two index arrays
+    # Station pairs without connection start at the first station, their travel time is inf
+    def get_connection_sources(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        sources = self.connection_sources[np.minimum(first, second), np.maximum(first, second)].astype(np.int64)
+        return np.where(sources < 0, first, sources)
+
+    # Transit times from the source to the target station indices of two index arrays
+    def get_travel_times(self, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        return self.travel_times[sources, targets].astype(np.float64)
+
+    # Station indices of the fastest connection from the source to the target station
+    def get_path_indices(self, source_index: int, target_index: int) -> list[int]:
+        predecessors = self.predecessors[source_index]
+        # Without connection the path only contains the target station, like in the shortest paths file
+        if predecessors[target_index] < 0:
+            return [target_index]
+        indices = [target_index]
+        while indices[-1] != source_index:
+            indices.append(int(predecessors[indices[-1]]))
+        return list(reversed(indices))
@@ -4,6 +4,8 @@ from program.utils import IdProvider
 ID_PROVIDER = IdProvider()
 
 class Station:
+    __slots__ = ("id", "position", "name")
+
     def __init__(self, id: int, position: Location, name: str) -> None:
         self.id = id
         self.position = position
@@ -0,0 +1,95 @@
+import math
+import numpy as np
+from scipy.spatial import cKDTree
+from params.program_params import ProgramParams
+from program.logger import LOGGER
+
+# Edges of the public transport graph between the stations of the subway data, used by the public
+# transport graph creation and the transit router. Rows of the data are (id, name, line, lat, lon).
+
+def lat_lon_to_meters(lat1, lon1, lat2, lon2):
+    # Conversion factors
+    meters_per_degree_lat = 111000  # approximately 111 kilometers per degree
+    meters_per_degree_lon = meters_per_degree_lat * math.cos(math.radians((lat1 + lat2) / 2))
+
+    # Conversion to meters
+    delta_lat_meters = (lat1 - lat2) * meters_per_degree_lat
+    delta_lon_meters = (lon1 - lon2) * meters_per_degree_lon
+
+    return delta_lat_meters, delta_lon_meters
+
+def manhattan_distance(lat1, lon1, lat2, lon2):
+    delta_lat_meters, delta_lon_meters = lat_lon_to_meters(lat1, lon1, lat2, lon2)
+    return abs(delta_lat_meters) + abs(delta_lon_meters)
+
+# Returns all index pairs (i, j) with i < j of stations closer than max_distance, sorted like a nested loop.
+# The projection uses the smallest longitude scale of all stations, so projected distances never exceed
+# the manhattan_distance of a pair and the query can only return too many pairs.
+def find_station_pairs_in_walking_distance(data, max_distance):
+    if len(data) < 2:
+        return []
+    lats = np.array([row[3] for row in data], dtype=np.float64)
+    lons = np.array([row[4] for row in data], dtype=np.float64)
+    meters_per_degree_lat = 111000
+    meters_per_degree_lon = meters_per_degree_lat * np.cos(np.radians(lats)).min()
+    points = np.column_stack((lats * meters_per_degree_lat, lons * meters_per_degree_lon))
+    # Manhattan radius query, slightly enlarged against rounding of the projection
+    pairs = cKDTree(points).query_pairs(max_distance * (1 + 1e-9) + 1e-6, p=1, output_type="ndarray")
+    return sorted(map(tuple, pairs.tolist()))
+
+def create_edges(data):
+    edges = []
+    station_duration = ProgramParams.STATION_DURATION # Set the value for Station_Duration here
+    transfer_same_station = ProgramParams.TRANSFER_SAME_STATION  # Set the value for Transfer_Same_Station here
+    max_walking_duration = ProgramParams.MAX_WALKING_DURATION
+    walking_speed = ProgramParams.WALKING_SPEED 
+    
+    # Count variables for the different types of edges
+    line_edges_count = 0
+    transfer_edges_count = 0
+    remaining_edges_count = 0
+
+    # Indices of the stations with the same name, in the order of the data
+    indices_by_name = {}
+    for i in range(len(data)):
+        if data[i][1] not in indices_by_name:
+            indices_by_name[data[i][1]] = []
+        indices_by_name[data[i][1]].append(i)
+
+    # Edges for the same line
+    for i in range(len(data) - 1):
+        id1, name1, line1, lat1, lon1 = data[i]
+        id2, name2, line2, lat2, lon2 = data[i + 1]
+        if line1 == line2:
+            edges.append((id1, id2, station_duration))
+            edges.append((id2, id1, station_duration))
+            line_edges_count += 1
+
+    # Edges for transfers at the same station, only stations of the same name are compared
+    for i in range(len(data)):
+        id1, name1, line1, lat1, lon1 = data[i]
+        for j in indices_by_name[name1]:
+            if j <= i:
+                continue
+            id2, name2, line2, lat2, lon2 = data[j]
+            if line1 != line2:
+                edges.append((id1, id2, transfer_same_station))
+                edges.append((id2, id1, transfer_same_station))
+                transfer_edges_count += 1
+
+    # Walking edges, only the station pairs of a radius query around each station are compared
+    for (i, j) in find_station_pairs_in_walking_distance(data, max_walking_duration / walking_speed):
+        id1, name1, line1, lat1, lon1 = data[i]
+        id2, name2, line2, lat2, lon2 = data[j]
+        distance = manhattan_distance(lat1, lon1, lat2, lon2)
+        cost = distance * walking_speed  # Calculation of costs
+
+        if cost < max_walking_duration and not (line1 == line2 or name1 == name2):
+            edges.append((id1, id2, cost))
+            edges.append((id2, id1, cost))
+            remaining_edges_count += 1
+
+    LOGGER.debug(f"Number of edges within the same line: {line_edges_count}")
+    LOGGER.debug(f"Number of edges for transfers at the same station: {transfer_edges_count}")
+    LOGGER.debug(f"Number of remaining edges: {remaining_edges_count}")
+    return edges
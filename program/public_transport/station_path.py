@@ -0,0 +1,35 @@
+from __future__ import annotations
+from collections.abc import Sequence
+from program.public_transport.fastest_station_connection_network import (
+    FastestStationConnectionNetwork,
+)
+from program.public_transport.station import Station
+
+
+# Stations of a fastest connection, only rebuilt from the network when needed.
+# The first station is known without walking the path.
+class StationPath(Sequence):
+    def __init__(self, network: FastestStationConnectionNetwork, source_index: int, target_index: int) -> None:
+        self.network = network
+        self.source_index = source_index
+        self.target_index = target_index
+        self._stations: list[Station] = None
+
+    def __getitem__(self, i):
+        if i == 0:
+            return self.network.stations[self.source_index]
+        return self.to_list()[i]
+
+    def __len__(self) -> int:
+        return len(self.to_list())
+
+    def to_list(self) -> list[Station]:
+        if self._stations == None:
+            self._stations = [
+                self.network.stations[i]
+                for i in self.network.get_path_indices(self.source_index, self.target_index)
+            ]
+        return self._stations
+
+    def __str__(self) -> str:
+        return str([station.id for station in self.to_list()])
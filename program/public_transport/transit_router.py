@@ -0,0 +1,208 @@
+from __future__ import annotations
+import heapq
+from collections import OrderedDict
+import numpy as np
+from params.program_params import ProgramParams
+from program.logger import LOGGER
+from program.public_transport.fastest_station_connection_network import (
+    FastestStationConnectionNetwork,
+)
+from program.public_transport.station import Station
+from program.public_transport.station_graph import create_edges
+from program.world_bundle import WorldBundle
+
+
+# Fastest connections computed on demand on the station graph instead of the precomputed station x station
+# matrices. Queries use A* with landmark lower bounds (ALT) and recently used station pairs are kept
+# in a LRU cache of TRANSIT_ROUTER_CACHE_SIZE entries.
+# The router replaces the table behind get_connection_sources, get_travel_times and get_path_indices.
+# These array accessors replaced get_fastest_connection of the network, which no longer exists.
+# Like the table, a station pair uses the connection starting at the station with the larger id.
+# Transit times are rounded like the table, among equally fast connections another path may be chosen.
+class TransitRouter(FastestStationConnectionNetwork):
+    def create() -> TransitRouter:
+        arrays = WorldBundle.get_arrays("stations", FastestStationConnectionNetwork.read_station_arrays)
+        (stations, lines) = FastestStationConnectionNetwork.read_stations(arrays)
+        router = TransitRouter(stations, lines, TransitRouter.station_edges(arrays))
+
+        landmark_arrays = WorldBundle.get_arrays("transit_router_landmarks", router.compute_landmark_arrays)
+        # Landmarks of the bundle are only used if they were selected for the same amount of landmarks
+        if int(landmark_arrays["requested_landmarks"]) != ProgramParams.TRANSIT_ROUTER_LANDMARKS:
+            landmark_arrays = router.compute_landmark_arrays()
+        router.set_landmarks(landmark_arrays)
+        return router
+
+    # Edges between the stations of the station arrays of FastestStationConnectionNetwork.read_station_arrays
+    def station_edges(arrays: dict[str, np.ndarray]) -> list[tuple[int, int, float]]:
+        # Same rows as read_csv_data of the public transport graph creation, sorted by id
+        station_data = list(
+            zip(
+                arrays["ids"].tolist(),
+                arrays["station_names"].tolist(),
+                arrays["lines"].tolist(),
+                arrays["lats"].tolist(),
+                arrays["longs"].tolist(),
+            )
+        )
+        station_data.sort(key=lambda x: x[0])
+        return create_edges(station_data)
+
+    def __init__(self, stations: list[Station], lines, edges: list[tuple[int, int, float]]) -> None:
+        super().__init__(None, None, None, stations, lines)
+
+        starts = np.array([self.index_by_station_id[edge[0]] for edge in edges], dtype=np.int64)
+        ends = np.array([self.index_by_station_id[edge[1]] for edge in edges], dtype=np.int64)
+        costs = np.array([edge[2] for edge in edges], dtype=np.float64)
+        # CSR adjacency of the graph and of the reversed graph
+        (self.offsets, self.targets, self.costs) = TransitRouter._csr(starts, ends, costs, len(stations))
+        (self.reverse_offsets, self.reverse_targets, self.reverse_costs) = TransitRouter._csr(
+            ends, starts, costs, len(stations)
+        )
+
+        # Set by set_landmarks
+        self.landmarks: list[int] = []
+        self.from_landmarks = np.zeros((0, len(stations)))
+        self.to_landmarks = np.zeros((0, len(stations)))
+        # Distances from and to all landmarks per station, for the lower bounds during the queries
+        self.station_from_landmarks: list[list[float]] = [[] for _ in stations]
+        self.station_to_landmarks: list[list[float]] = [[] for _ in stations]
+
+        # (source index, target index) -> (transit time, station indices of the path)
+        self.cache: OrderedDict[tuple[int, int], tuple[float, list[int]]] = OrderedDict()
+
+    # Selects up to TRANSIT_ROUTER_LANDMARKS landmarks, each the station farthest from all landmarks so far.
+    # Rows of from_landmarks and to_landmarks are the distances from and to each landmark.
+    def compute_landmark_arrays(self) -> dict[str, np.ndarray]:
+        landmarks = []
+        from_landmarks = []
+        to_landmarks = []
+        distances_to_closest_landmark = np.full(len(self.stations), np.inf)
+        for _ in range(min(ProgramParams.TRANSIT_ROUTER_LANDMARKS, len(self.stations))):
+            if len(landmarks) == 0:
+                landmark = 0
+            else:
+                reachable = np.where(np.isfinite(distances_to_closest_landmark), distances_to_closest_landmark, -1)
+                landmark = int(np.argmax(reachable))
+                if reachable[landmark] <= 0:
+                    break
+            landmarks.append(landmark)
+            from_landmarks.append(self._dijkstra(landmark, self.offsets, self.targets, self.costs))
+            to_landmarks.append(
+                self._dijkstra(landmark, self.reverse_offsets, self.reverse_targets, self.reverse_costs)
+            )
+            distances_to_closest_landmark = np.minimum(distances_to_closest_landmark, from_landmarks[-1])
+        return {
+            "requested_landmarks": np.array(ProgramParams.TRANSIT_ROUTER_LANDMARKS, dtype=np.int64),
+            "landmarks": np.array(landmarks, dtype=np.int64),
+            "from_landmarks": np.array(from_landmarks, dtype=np.float64).reshape(len(landmarks), len(self.stations)),
+            "to_landmarks": np.array(to_landmarks, dtype=np.float64).reshape(len(landmarks), len(self.stations)),
+        }
+
+    def set_landmarks(self, arrays: dict[str, np.ndarray]) -> None:
+        if arrays["from_landmarks"].shape[1] != len(self.stations):
+            raise Exception("Landmarks do not match the stations, please recreate the world bundle")
+        self.landmarks = arrays["landmarks"].tolist()
+        self.from_landmarks = arrays["from_landmarks"]
+        self.to_landmarks = arrays["to_landmarks"]
+        self.station_from_landmarks = np.asarray(self.from_landmarks).T.tolist()
+        self.station_to_landmarks = np.asarray(self.to_landmarks).T.tolist()
+        LOGGER.debug(f"Transit router uses {len(self.landmarks)} landmarks for {len(self.stations)} stations")
+
+    def _csr(starts: np.ndarray, ends: np.ndarray, costs: np.ndarray, size: int) -> tuple[list[int], list[int], list[float]]:
+        order = np.argsort(starts, kind="stable")
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(starts, minlength=size), out=offsets[1:])
+        return (offsets.tolist(), ends[order].tolist(), costs[order].tolist())
+
+    def _dijkstra(self, source: int, offsets: list[int], targets: list[int], costs: list[float]) -> np.ndarray:
+        distances = [float("inf")] * (len(offsets) - 1)
+        distances[source] = 0.0
+        heap = [(0.0, source)]
+        while len(heap) > 0:
+            (distance, v) = heapq.heappop(heap)
+            if distance > distances[v]:
+                continue
+            for k in range(offsets[v], offsets[v + 1]):
+                path_cost = distance + costs[k]
+                if path_cost < distances[targets[k]]:
+                    distances[targets[k]] = path_cost
+                    heapq.heappush(heap, (path_cost, targets[k]))
+        return np.array(distances)
+
+    # Lower bound of the distance of a station to the target by the triangle inequality, only computed
+    # for the stations a query reaches. Landmarks which cannot reach both stations give no bound.
+    def _lower_bound(self, station: int, target_from_landmarks: list[float], target_to_landmarks: list[float]) -> float:
+        bound = 0.0
+        for (from_landmark, to_landmark, target_from_landmark, target_to_landmark) in zip(
+            self.station_from_landmarks[station],
+            self.station_to_landmarks[station],
+            target_from_landmarks,
+            target_to_landmarks,
+        ):
+            # Differences of two infinite distances are nan and never larger than the bound
+            if target_from_landmark - from_landmark > bound:
+                bound = target_from_landmark - from_landmark
+            if to_landmark - target_to_landmark > bound:
+                bound = to_landmark - target_to_landmark
+        return bound
+
+    # Returns: tuple[transit time, station indices of the path], the time is infinite without connection
+    def query(self, source: int, target: int) -> tuple[float, list[int]]:
+        key = (source, target)
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        # Station pairs of the same station have no connection like in the table
+        result = (float("inf"), [target])
+        if source != target:
+            target_from_landmarks = self.station_from_landmarks[target]
+            target_to_landmarks = self.station_to_landmarks[target]
+            heuristic = {source: self._lower_bound(source, target_from_landmarks, target_to_landmarks)}
+            distances = {source: 0.0}
+            predecessors = {source: None}
+            heap = [(heuristic[source], source)]
+            while len(heap) > 0:
+                (priority, v) = heapq.heappop(heap)
+                if priority > distances[v] + heuristic[v]:
+                    continue
+                if v == target:
+                    path = [target]
+                    while path[-1] != source:
+                        path.append(predecessors[path[-1]])
+                    result = (float(np.float32(distances[target])), list(reversed(path)))
+                    break
+                for k in range(self.offsets[v], self.offsets[v + 1]):
+                    neighbour = self.targets[k]
+                    path_cost = distances[v] + self.costs[k]
+                    if path_cost < distances.get(neighbour, float("inf")):
+                        distances[neighbour] = path_cost
+                        predecessors[neighbour] = v
+                        if neighbour not in heuristic:
+                            heuristic[neighbour] = self._lower_bound(
+                                neighbour, target_from_landmarks, target_to_landmarks
+                            )
+                        heapq.heappush(heap, (path_cost + heuristic[neighbour], neighbour))
+
+        self.cache[key] = result
+        if len(self.cache) > ProgramParams.TRANSIT_ROUTER_CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return result
+
+    def get_connection_sources(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        return np.maximum(first, second).astype(np.int64)
+
+    def get_travel_times(self, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        (sources, targets) = np.broadcast_arrays(np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64))
+        # Every station pair is only queried once
+        (pairs, inverse) = np.unique(
+            sources.ravel() * len(self.stations) + targets.ravel(), return_inverse=True
+        )
+        times = np.array(
+            [self.query(pair // len(self.stations), pair % len(self.stations))[0] for pair in pairs.tolist()],
+            dtype=np.float64,
+        )
+        return times[inverse].reshape(sources.shape)
+
+    def get_path_indices(self, source_index: int, target_index: int) -> list[int]:
+        return self.query(source_index, target_index)[1]
@@ -8,6 +8,7 @@ from program.data_collector import DataCollector
 from program.grid.grid import Grid
 from program.interval.average_time_reduction import AverageTimeReduction
 from program.interval.grid_interval import GridInterval
+from program.order.open_orders import OpenOrders
 from program.order.orders import Orders
 from program.vehicle.vehicles import Vehicles
 from program.interval.time import Time
@@ -35,11 +36,12 @@ class State:
         return State._state
 
     def __init__(self) -> None:
-        # Dict containing orders mapped by id
-        self.orders_dict: dict[int, Order] = {}
+        # Open orders mapped by id and expiry
+        self.open_orders = OpenOrders()
 
         self.current_interval = TimeSeries.get_instance().intervals[0]
-        self.current_time = self.current_interval.start
+        # Simulation time in total seconds of the day
+        self.current_total_seconds = self.current_interval.start.to_total_seconds()
 
         # {"last_interval": num, "now": num}
         self.amount_of_orders_per_zone: dict[Zone, dict[str, float]] = {zone: {"last_interval": 0, "now": 0} for zone in Zones.get_zones()}
@@ -101,15 +103,15 @@ class State:
                         )
                     )
                 # Remove order from open orders set
-                del self.orders_dict[route.order.id]
+                del self.open_orders[route.order.id]
 
         self.update_average_time_reductions()
         self.apply_state_changes_to_value_function()
         self.action_reward_tuples = []
 
-        amount_of_unserved_orders = len(self.orders_dict)
+        amount_of_unserved_orders = len(self.open_orders)
         DataCollector.append_orders_data(
-            self.current_time,
+            self.current_total_seconds,
             (
                 amount_of_unserved_orders
                 / (amount_of_unserved_orders + len(order_time_reduction_quota))
@@ -124,12 +126,11 @@ class State:
             else 0
         )
         DataCollector.append_time_reduction_quota(
-            self.current_time, average_time_reduction_quota
+            self.current_total_seconds, average_time_reduction_quota
         )
 
         # Compute job state changes for all vehicles
-        for vehicle in Vehicles.get_vehicles():
-            vehicle.update_job_status(ProgramParams.SIMULATION_UPDATE_RATE)
+        Vehicles.get_fleet().update_job_status(ProgramParams.SIMULATION_UPDATE_RATE)
 
     def update_average_time_reductions(self) -> None:
         for tup in self.action_reward_tuples:
@@ -143,30 +144,23 @@ class State:
             StateValueNetworks.get_instance().adjust_state_values(self.action_reward_tuples)
 
     def update_order_expiry_duration(self) -> None:
-        duration = ProgramParams.SIMULATION_UPDATE_RATE
-        orders_to_delete = []
-        for id in self.orders_dict:
-            self.orders_dict[id].expires -= duration
-            if self.orders_dict[id].expires <= 0:
-                orders_to_delete.append(id)
-        # Delete expired orders
-        for id in orders_to_delete:
-            del self.orders_dict[id]
+        self.open_orders.expire()
 
     def add_orders(self, orders: list[Order]) -> None:
         for order in orders:
-            self.orders_dict[order.id] = order
+            self.open_orders.add(order)
 
-    def increment_time_interval(self, current_time: Time) -> None:
-        if self.current_interval.end.is_before(current_time):
-            self.current_interval = TimeSeries.get_instance().get_next_interval(self.current_interval)
+    def increment_time_interval(self, current_total_seconds: int) -> None:
+        interval = TimeSeries.get_instance().find_interval(current_total_seconds)
+        if interval != self.current_interval:
+            self.current_interval = interval
             for zone in Zones.get_zones():
                 self.amount_of_orders_per_zone[zone]["last_interval"] = self.amount_of_orders_per_zone[zone]["now"]
                 self.amount_of_orders_per_zone[zone]["now"] = 0
                 self.amount_of_vehicles_per_zone[zone]["idle"] = 0
                 self.amount_of_vehicles_per_zone[zone]["occupied"] = 0
 
-        self.current_time = current_time
+        self.current_total_seconds = current_total_seconds
 
     def relocate(self) -> None:
         from program.grid.grid import Grid
@@ -205,7 +199,7 @@ class State:
                     ):
                         state_value = (
                             StateValueNetworks.get_instance().get_target_state_value(
-                                Action(None), cell.zone, self.current_time.add_seconds(driving_time)
+                                Action(None), cell.zone, Time.wrap_total_seconds(self.current_total_seconds + driving_time)
                             )
                         )
                     else:
@@ -245,7 +239,7 @@ class State:
                 vehicle.set_new_relocation_job(driving_time, relocation_cell.center)
                 vehicle.idle_time = 0
                 DataCollector.append_relocation_trip_data(
-                    self.current_time,
+                    self.current_total_seconds,
                     current_cell.zone,
                     relocation_cell.zone,
                     int(vehicle.current_position.distance_to(relocation_cell.center)),
@@ -253,25 +247,25 @@ class State:
     
     def update_state(self) -> None:
         zones = Zones.get_zones()
-        vehicles = Vehicles.get_vehicles()
-        amount_orders_now_per_zone = {zone: 0 for zone in zones}
-
-        for order in Orders.get_orders_by_time()[self.current_time]:
-            amount_orders_now_per_zone[order.zone] += 1
+        fleet = Vehicles.get_fleet()
+        zone_counts = Orders.get_zone_counts(Time.of_total_seconds(self.current_total_seconds)).tolist()
 
         for zone in zones:
-            self.amount_of_orders_per_zone[zone]["now"] += amount_orders_now_per_zone[zone]
+            if zone.id < len(zone_counts):
+                self.amount_of_orders_per_zone[zone]["now"] += zone_counts[zone.id]
 
-        for vehicle in vehicles:
-            if vehicle.is_occupied():
+        grid = Grid.get_instance()
+        zone_ids = grid.find_zones(fleet.lats, fleet.lons)
+        for is_occupied, zone_id in zip(fleet.is_occupied.tolist(), zone_ids.tolist()):
+            if is_occupied:
                 key = "occupied"
             else:
                 key = "idle"
-            zone = Grid.get_instance().find_zone(vehicle.current_position)
+            zone = grid.zones_dict[zone_id]
             self.amount_of_vehicles_per_zone[zone][key] += 1
     
     def get_current_order_quota(self, zone: Zone) -> float:
-        difference_since_last_interval = self.current_interval.start.distance_to(self.current_time) / 60
+        difference_since_last_interval = (self.current_total_seconds - self.current_interval.start.to_total_seconds()) / 60
         if difference_since_last_interval == 0:
             return 0
         return self.amount_of_orders_per_zone[zone]["now"] / difference_since_last_interval
@@ -280,13 +274,13 @@ class State:
         return self.amount_of_orders_per_zone[zone]["last_interval"] / 30
 
     def get_idle_vehicle_quota(self, zone: Zone) -> float:
-        difference_since_last_interval = self.current_interval.start.distance_to(self.current_time) / 60
+        difference_since_last_interval = (self.current_total_seconds - self.current_interval.start.to_total_seconds()) / 60
         if difference_since_last_interval == 0:
             return 0
         return self.amount_of_vehicles_per_zone[zone]["idle"] / difference_since_last_interval
 
     def get_occupied_vehicle_quota(self, zone: Zone) -> float:
-        difference_since_last_interval = self.current_interval.start.distance_to(self.current_time) / 60
+        difference_since_last_interval = (self.current_total_seconds - self.current_interval.start.to_total_seconds()) / 60
         if difference_since_last_interval == 0:
             return 0
         return self.amount_of_vehicles_per_zone[zone]["occupied"] / difference_since_last_interval
@@ -9,7 +9,6 @@ from program.graph_reinforcement_learning.target_network import TargetNetwork
 from program.graph_reinforcement_learning.temporal_difference_loss import (
     TemporalDifferenceLoss,
 )
-from program.interval.time import Time
 from program.zone.zone import Zone
 from program.logger import LOGGER
 
@@ -33,8 +32,8 @@ class StateValueNetworks:
 
         self.iteration = 0
 
-    def get_target_state_value(self, action: Action, zone: Zone, time: Time) -> float:
-        return self.target_net.get_state_value(action, zone, time)
+    def get_target_state_value(self, action: Action, zone: Zone, total_seconds: int) -> float:
+        return self.target_net.get_state_value(action, zone, total_seconds)
 
     def initialize_iteration(self) -> None:
         from program.state.state import State
@@ -69,42 +68,61 @@ class StateValueNetworks:
         self.target_net.calculate_graph_embedding(
             zone_graph.get_edge_index(), zone_graph.get_feature_index()
         )
+        self.target_net.calculate_state_value_table(
+            [zone for zone in Zones.get_zones() if zone.id in zone_graph.zone_to_node]
+        )
 
     # We want a list of action tuples here since the error function is calculated in each iteration for all changes
     def adjust_state_values(
         self, action_reward_tuples: list[tuple[Zone, VehicleActionPair, float]]
     ) -> None:
-        from program.state.state import State
-        
         # Only update network weights if there are vehicle action matches
         if len(action_reward_tuples) > 0:
-            # Calculate main values
-            for tup in action_reward_tuples:
-                self.main_net.get_state_value(tup[1].action, tup[0], State.get_state().current_time)
-
-            td_values = []
-            for tup in action_reward_tuples:
-                td_values.append(
-                    {
-                        "reward": tup[2],
-                        "main_value": self.main_net.get_state_value_by_action_id(
-                            tup[1].action.id
-                        ),
-                        "target_value": self.target_net.get_state_value_by_action_id(
-                            tup[1].action.id
-                        ),
-                        "discount_value": ProgramParams.DISCOUNT_FACTOR(
-                            tup[1].get_total_vehicle_travel_time_in_seconds()
-                        ),
-                    }
-                )
+            # State values are saved by action id, so pairs sharing the same action (e.g. idling)
+            # use the state value of the last of these pairs
+            last_index_by_action_id = {
+                action_reward_tuples[i][1].action.id: i
+                for i in range(len(action_reward_tuples))
+            }
+            row_by_action_id = {
+                action_id: row for row, action_id in enumerate(last_index_by_action_id)
+            }
+
+            # Calculate main values in one forward pass
+            main_values = self.main_net.get_state_values(
+                [
+                    action_reward_tuples[i][0]
+                    for i in last_index_by_action_id.values()
+                ]
+            )
+            main_values = main_values[
+                [row_by_action_id[tup[1].action.id] for tup in action_reward_tuples]
+            ]
+            target_values = torch.stack(
+                [
+                    self.target_net.get_state_value_by_action_id(tup[1].action.id)
+                    for tup in action_reward_tuples
+                ]
+            ).reshape(-1)
+            rewards = torch.tensor(
+                [tup[2] for tup in action_reward_tuples], dtype=torch.float
+            )
+            discount_values = torch.tensor(
+                [
+                    ProgramParams.DISCOUNT_FACTOR(
+                        tup[1].get_total_vehicle_travel_time_in_seconds()
+                    )
+                    for tup in action_reward_tuples
+                ],
+                dtype=torch.float,
+            )
 
             LOGGER.debug("Backward propagation and optimization")
             # Backward and optimize
             self.main_net.optimizer_zero_grad()
             # Compute loss
-            loss = self.loss_fn(td_values)
-            LOGGER.debug(f"Temporal difference error: {float(loss)}")
+            loss = self.loss_fn(main_values, target_values, discount_values, rewards)
+            LOGGER.debug(f"Temporal difference error: {loss.item()}")
             loss.backward()
             self.main_net.optimizer_step()
 
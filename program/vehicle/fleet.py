@@ -0,0 +1,124 @@
+from __future__ import annotations
+import numpy as np
+from program.location.location import Location
+from params.program_params import ProgramParams
+from program.vehicle.vehicle_job import VehicleJob
+
+
+# Array based store of all vehicle states, one entry per vehicle in each column.
+# Vehicle objects are views on one index of a fleet, so jobs of the whole fleet
+# can be advanced in one vectorized update.
+class Fleet:
+    def __init__(self, positions: list[Location], ids: list[int]) -> None:
+        size = len(positions)
+        self.ids = np.array(ids, dtype=np.int64)
+        self.lats = np.array([position.lat for position in positions], dtype=np.float64)
+        self.lons = np.array([position.lon for position in positions], dtype=np.float64)
+        # Time that passed since drivers last job
+        self.idle_times = np.zeros(size, dtype=np.int64)
+        self.is_occupied = np.zeros(size, dtype=bool)
+        self.is_relocation = np.zeros(size, dtype=bool)
+
+        # Job columns, positions are interpolated in steps of the simulation update rate
+        self.open_trip_times = np.zeros(size, dtype=np.float64)
+        # Time in seconds already driven in the current job
+        self.job_elapsed_times = np.zeros(size, dtype=np.float64)
+        self.pickup_stops = np.zeros(size, dtype=np.int64)
+        self.dropoff_stops = np.zeros(size, dtype=np.int64)
+        self.start_lats = np.zeros(size, dtype=np.float64)
+        self.start_lons = np.zeros(size, dtype=np.float64)
+        self.pickup_lats = np.zeros(size, dtype=np.float64)
+        self.pickup_lons = np.zeros(size, dtype=np.float64)
+        self.final_lats = np.zeros(size, dtype=np.float64)
+        self.final_lons = np.zeros(size, dtype=np.float64)
+        self.pickup_lat_steps = np.zeros(size, dtype=np.float64)
+        self.pickup_lon_steps = np.zeros(size, dtype=np.float64)
+        self.dropoff_lat_steps = np.zeros(size, dtype=np.float64)
+        self.dropoff_lon_steps = np.zeros(size, dtype=np.float64)
+
+        self.jobs: list[VehicleJob] = [None for _ in range(size)]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def get_position(self, index: int) -> Location:
+        return Location(float(self.lats[index]), float(self.lons[index]))
+
+    def set_position(self, index: int, position: Location) -> None:
+        self.lats[index] = position.lat
+        self.lons[index] = position.lon
+
+    def set_job(self, index: int, job: VehicleJob) -> None:
+        self.jobs[index] = job
+        self.is_occupied[index] = True
+        self.is_relocation[index] = job.is_relocation
+        self.open_trip_times[index] = job.total_driving_time
+        self.job_elapsed_times[index] = 0
+        self.pickup_stops[index] = job.pickup_stops
+        self.dropoff_stops[index] = job.dropoff_stops
+        self.start_lats[index] = job.pre_pickup_position.lat
+        self.start_lons[index] = job.pre_pickup_position.lon
+        self.pickup_lats[index] = job.pickup_position.lat
+        self.pickup_lons[index] = job.pickup_position.lon
+        self.final_lats[index] = job.final_position.lat
+        self.final_lons[index] = job.final_position.lon
+        self.pickup_lat_steps[index] = job.pickup_lat_step
+        self.pickup_lon_steps[index] = job.pickup_lon_step
+        self.dropoff_lat_steps[index] = job.dropoff_lat_step
+        self.dropoff_lon_steps[index] = job.dropoff_lon_step
+
+    # Duration in seconds, selected is a boolean mask of the vehicles to update (all by default)
+    def update_job_status(self, duration: int, selected: np.ndarray = None) -> None:
+        occupied = self.is_occupied if selected is None else self.is_occupied & selected
+        idle = ~self.is_occupied if selected is None else ~self.is_occupied & selected
+
+        self.idle_times[idle] += duration
+        self.idle_times[occupied] = 0
+
+        # Job is finished by next interval
+        finished = occupied & (self.open_trip_times - duration < 0)
+        self.lats[finished] = self.final_lats[finished]
+        self.lons[finished] = self.final_lons[finished]
+        self.is_occupied[finished] = False
+        self.is_relocation[finished] = False
+        for index in np.nonzero(finished)[0].tolist():
+            self.jobs[index] = None
+
+        driving = np.nonzero(occupied & ~finished)[0]
+        self.open_trip_times[driving] -= duration
+        self.job_elapsed_times[driving] += duration
+        (self.lats[driving], self.lons[driving]) = self.interpolate(
+            driving, self.job_elapsed_times[driving]
+        )
+
+    # Positions of the jobs of the given vehicles after the elapsed times in seconds. Whole simulation
+    # updates hit the same positions as a step by step interpolation.
+    def interpolate(
+        self, indices: np.ndarray, elapsed_times: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        steps = elapsed_times / ProgramParams.SIMULATION_UPDATE_RATE
+        pickup_stops = self.pickup_stops[indices]
+        dropoff_steps = steps - pickup_stops
+        in_pickup = steps <= pickup_stops
+        in_dropoff = ~in_pickup & (dropoff_steps <= self.dropoff_stops[indices])
+
+        # Afterwards the vehicle waits at its final position
+        lats = np.where(
+            in_pickup,
+            steps * self.pickup_lat_steps[indices] + self.start_lats[indices],
+            np.where(
+                in_dropoff,
+                dropoff_steps * self.dropoff_lat_steps[indices] + self.pickup_lats[indices],
+                self.final_lats[indices],
+            ),
+        )
+        lons = np.where(
+            in_pickup,
+            steps * self.pickup_lon_steps[indices] + self.start_lons[indices],
+            np.where(
+                in_dropoff,
+                dropoff_steps * self.dropoff_lon_steps[indices] + self.pickup_lons[indices],
+                self.final_lons[indices],
+            ),
+        )
+        return (lats, lons)
@@ -1,39 +1,61 @@
 from __future__ import annotations
+import numpy as np
 from program.vehicle.vehicle_job import VehicleJob
 from program.location.location import Location
 from program.utils import IdProvider
 
 ID_PROVIDER = IdProvider()
 
+# View on one index of a fleet, all state lives in the columns of the fleet
 class Vehicle:
+    __slots__ = ("id", "fleet", "index")
 
     def __init__(self, start_position: Location, id: int = None) -> None:
+        from program.vehicle.fleet import Fleet
+
         self.id = id if id != None else ID_PROVIDER.get_id()
-        self.current_position = start_position
-        self.job: VehicleJob = None
-        # Time that passed since drivers last job
-        self.idle_time = 0
+        self.fleet = Fleet([start_position], [self.id])
+        self.index = 0
+
+    def of_fleet(fleet, index: int) -> Vehicle:
+        vehicle = Vehicle.__new__(Vehicle)
+        vehicle.id = int(fleet.ids[index])
+        vehicle.fleet = fleet
+        vehicle.index = index
+        return vehicle
+
+    @property
+    def current_position(self) -> Location:
+        return self.fleet.get_position(self.index)
+
+    @current_position.setter
+    def current_position(self, position: Location) -> None:
+        self.fleet.set_position(self.index, position)
+
+    @property
+    def job(self) -> VehicleJob:
+        return self.fleet.jobs[self.index]
+
+    # Time that passed since drivers last job
+    @property
+    def idle_time(self) -> int:
+        return int(self.fleet.idle_times[self.index])
+
+    @idle_time.setter
+    def idle_time(self, idle_time: int) -> None:
+        self.fleet.idle_times[self.index] = idle_time
 
     def is_occupied(self) -> bool:
-        return self.job != None
+        return self.fleet.jobs[self.index] != None
 
     def set_new_job(self, total_driving_time: int, passenger_pickup_time: int, pickup_position: Location, new_position: Location) -> None:
-        self.job = VehicleJob.of_trip(total_driving_time, passenger_pickup_time, self.current_position, pickup_position, new_position)
-    
+        self.fleet.set_job(self.index, VehicleJob.of_trip(total_driving_time, passenger_pickup_time, self.current_position, pickup_position, new_position))
+
     def set_new_relocation_job(self, total_driving_time: int, new_position: Location) -> None:
-        self.job = VehicleJob.of_relocation(total_driving_time, self.current_position, new_position)
+        self.fleet.set_job(self.index, VehicleJob.of_relocation(total_driving_time, self.current_position, new_position))
 
-    # Duration in seconds
+    # Duration in seconds, use Fleet.update_job_status to update all vehicles at once
     def update_job_status(self, duration: int) -> None:
-        if self.job == None:
-            self.idle_time += duration
-            return
-
-        self.idle_time = 0
-        if self.job.open_trip_time - duration < 0:
-            # Job is finished by next interval
-            self.current_position = self.job.final_position
-            self.job = None
-        else:
-            self.job.open_trip_time -= duration
-            self.current_position = self.job.get_next_position()
+        selected = np.zeros(len(self.fleet), dtype=bool)
+        selected[self.index] = True
+        self.fleet.update_job_status(duration, selected)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+import math
+from program.location.location import Location
+from program.vehicle.vehicle import Vehicle
+
+
+# Spatial index over vehicle positions using uniform buckets as large as the search radius.
+# Location.distance_to is a weighted manhattan distance, so every vehicle within the radius
+# of a location lies in the bucket of the location or in one of its eight neighbours.
+class VehicleIndex:
+    def __init__(self, vehicles: list[Vehicle], radius: float) -> None:
+        self.radius = radius
+        self.buckets: dict[tuple[int, int], list[Vehicle]] = {}
+
+        for vehicle in vehicles:
+            key = self.get_bucket(vehicle.current_position)
+            if key not in self.buckets:
+                self.buckets[key] = []
+            self.buckets[key].append(vehicle)
+
+    # Buckets use the same meter scaling as Location.distance_to
+    def get_bucket(self, location: Location) -> tuple[int, int]:
+        return (
+            math.floor(111.3 * location.lat * 1000 / self.radius),
+            math.floor(71.5 * location.lon * 1000 / self.radius),
+        )
+
+    # Returns all vehicles with a distance of at most the radius to the location
+    def find_vehicles_in_range(self, location: Location) -> list[Vehicle]:
+        (i, j) = self.get_bucket(location)
+        vehicles = []
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                for vehicle in self.buckets.get((i + di, j + dj), []):
+                    if location.distance_to(vehicle.current_position) <= self.radius:
+                        vehicles.append(vehicle)
+        return vehicles
@@ -1,4 +1,5 @@
 import csv
+from program.vehicle.fleet import Fleet
 from program.vehicle.vehicle import Vehicle
 from program.grid.grid import Grid
 from program.location.location import Location
@@ -7,19 +8,27 @@ from program.location.location import Location
 # Singleton class containing all the vehicles
 class Vehicles:
     _vehicles: list[Vehicle] = None
+    _fleet: Fleet = None
 
     def get_vehicles() -> list[Vehicle]:
         if Vehicles._vehicles == None:
-            Vehicles._vehicles = []
+            ids = []
+            locations = []
             with open("input_data/vehicles.csv", mode="r") as file:
                 reader = csv.DictReader(file)
                 for row in reader:
-                    id = int(row["vehicle_id"])
-                    location = Location(float(row["lat"]), float(row["lon"]))
-                    Vehicles._vehicles.append(Vehicle(location, id=id))
+                    ids.append(int(row["vehicle_id"]))
+                    locations.append(Location(float(row["lat"]), float(row["lon"])))
+            Vehicles._fleet = Fleet(locations, ids)
+            Vehicles._vehicles = [Vehicle.of_fleet(Vehicles._fleet, i) for i in range(len(ids))]
 
         return Vehicles._vehicles
 
+    # Array based states of all vehicles, the vehicles are views on it
+    def get_fleet() -> Fleet:
+        Vehicles.get_vehicles()
+        return Vehicles._fleet
+
     def export_vehicles() -> None:
         vehicles = Vehicles.get_vehicles()
         with open("input_data/vehicles.csv", mode="w") as file:
@@ -36,3 +45,4 @@ class Vehicles:
     
     def raze_vehicles():
         Vehicles._vehicles = None
+        Vehicles._fleet = None
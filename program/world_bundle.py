@@ -0,0 +1,98 @@
+from __future__ import annotations
+import json
+import os
+import numpy as np
+from program.logger import LOGGER
+
+WORLD_BUNDLE_FILE_PATH = "data/world_bundle.bin"
+# Needs to be increased after changes to the arrays of a group, older bundles have to be recreated
+WORLD_BUNDLE_VERSION = 2
+WORLD_BUNDLE_MAGIC = b"GRLWORLD"
+# Arrays start at multiples of the alignment, so every array can be viewed directly in the memory map
+WORLD_BUNDLE_ALIGNMENT = 64
+
+
+# Singleton class containing the static data of the data folder compiled to NumPy arrays.
+# The arrays are grouped by the class loading them, e.g. "zones" -> "zone_ids" -> array.
+# Layout: magic, version (uint32), header length (uint32), JSON header with dtype, shape and offset
+# of each array, then the aligned raw array data. The file is memory mapped read-only, so loading it
+# only reads the header and processes on the same machine share the pages of the operating system.
+class WorldBundle:
+    _world_bundle: WorldBundle = None
+
+    # Returns None if no bundle was created, the data is read from the csv files then
+    def get_instance() -> WorldBundle:
+        if WorldBundle._world_bundle == None and os.path.isfile(WORLD_BUNDLE_FILE_PATH):
+            LOGGER.debug("Starting to load world bundle")
+            WorldBundle._world_bundle = WorldBundle.load(WORLD_BUNDLE_FILE_PATH)
+            LOGGER.debug("Finished to load world bundle")
+        return WorldBundle._world_bundle
+
+    # Arrays of a group from the bundle if it exists, else from read_arrays
+    def get_arrays(group: str, read_arrays) -> dict[str, np.ndarray]:
+        bundle = WorldBundle.get_instance()
+        if bundle == None:
+            return read_arrays()
+        if group not in bundle.groups:
+            raise Exception(f"World bundle {WORLD_BUNDLE_FILE_PATH} has no group {group}, please recreate it")
+        return bundle.groups[group]
+
+    def __init__(self, groups: dict[str, dict[str, np.ndarray]]) -> None:
+        self.groups = groups
+
+    def load(path: str) -> WorldBundle:
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        prefix_length = len(WORLD_BUNDLE_MAGIC) + 8
+        if len(buffer) < prefix_length or bytes(buffer[:len(WORLD_BUNDLE_MAGIC)]) != WORLD_BUNDLE_MAGIC:
+            raise Exception(f"{path} is no world bundle")
+        (version, header_length) = np.frombuffer(buffer, dtype="<u4", count=2, offset=len(WORLD_BUNDLE_MAGIC)).tolist()
+        if version != WORLD_BUNDLE_VERSION:
+            raise Exception(
+                f"World bundle {path} has version {version} instead of {WORLD_BUNDLE_VERSION}, please recreate it"
+            )
+        header = json.loads(bytes(buffer[prefix_length:prefix_length + header_length]))
+        data_start = WorldBundle.data_start(header_length)
+
+        groups = {}
+        for group in header:
+            groups[group] = {}
+            for (name, info) in header[group].items():
+                groups[group][name] = np.ndarray(
+                    tuple(info["shape"]), dtype=np.dtype(info["dtype"]), buffer=buffer, offset=data_start + info["offset"]
+                )
+        return WorldBundle(groups)
+
+    # Array offsets in the header are relative to the first aligned position after the header
+    def data_start(header_length: int) -> int:
+        data_start = len(WORLD_BUNDLE_MAGIC) + 8 + header_length
+        return data_start + -data_start % WORLD_BUNDLE_ALIGNMENT
+
+    # Writes the bundle to a temporary file first, so a running process never maps a half written bundle
+    def export(self, path: str) -> None:
+        header = {}
+        offset = 0
+        arrays = []
+        for group in self.groups:
+            header[group] = {}
+            for (name, array) in self.groups[group].items():
+                array = np.asarray(array, order="C")
+                offset += -offset % WORLD_BUNDLE_ALIGNMENT
+                header[group][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+                arrays.append(array)
+                offset += array.nbytes
+
+        encoded_header = json.dumps(header).encode("utf-8")
+        data_start = WorldBundle.data_start(len(encoded_header))
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, mode="wb") as file:
+            file.write(WORLD_BUNDLE_MAGIC)
+            file.write(np.array([WORLD_BUNDLE_VERSION, len(encoded_header)], dtype="<u4").tobytes())
+            file.write(encoded_header)
+            position = len(WORLD_BUNDLE_MAGIC) + 8 + len(encoded_header)
+            for (info, array) in zip([info for group in header for info in header[group].values()], arrays):
+                file.write(b"\0" * (data_start + info["offset"] - position))
+                file.write(array.tobytes())
+                position = data_start + info["offset"] + array.nbytes
+            # Empty arrays at the end still need their offset inside of the file
+            file.write(b"\0" * (data_start + offset - position))
+        os.replace(temporary_path, path)
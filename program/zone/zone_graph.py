@@ -1,7 +1,9 @@
 from __future__ import annotations
 from collections import namedtuple
 import csv
+import numpy as np
 
+from program.world_bundle import WorldBundle
 from program.zone.zone import Zone
 
 
@@ -24,23 +26,34 @@ class ZoneGraph:
             current_index = 0
             edge_list = []
             zone_to_node = {}
-            with open("data/zone_graph.csv", mode="r") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    zone1_id = int(row["zone1_id"])
-                    if not zone1_id in zone_to_node:
-                        zone_to_node[zone1_id] = current_index
-                        current_index += 1
-                    zone2_id = int(row["zone2_id"])
-                    if not zone2_id in zone_to_node:
-                        zone_to_node[zone2_id] = current_index
-                        current_index += 1
+            arrays = WorldBundle.get_arrays("zone_graph", ZoneGraph.read_arrays)
+            for (zone1_id, zone2_id) in zip(arrays["zone1_ids"].tolist(), arrays["zone2_ids"].tolist()):
+                if not zone1_id in zone_to_node:
+                    zone_to_node[zone1_id] = current_index
+                    current_index += 1
+                if not zone2_id in zone_to_node:
+                    zone_to_node[zone2_id] = current_index
+                    current_index += 1
 
-                    edge_list.append((zone_to_node[zone1_id], zone_to_node[zone2_id]))
+                edge_list.append((zone_to_node[zone1_id], zone_to_node[zone2_id]))
 
             ZoneGraph._zone_graph = ZoneGraph(edge_list, zone_to_node)
         return ZoneGraph._zone_graph
 
+    # Edges in the order of the zone graph file
+    def read_arrays() -> dict[str, np.ndarray]:
+        zone1_ids = []
+        zone2_ids = []
+        with open("data/zone_graph.csv", mode="r") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                zone1_ids.append(int(row["zone1_id"]))
+                zone2_ids.append(int(row["zone2_id"]))
+        return {
+            "zone1_ids": np.array(zone1_ids, dtype=np.int64),
+            "zone2_ids": np.array(zone2_ids, dtype=np.int64),
+        }
+
     def __init__(
         self, edge_list: list[tuple[int, int]], zone_to_node: dict[int, int]
     ) -> None:
@@ -1,6 +1,8 @@
 import csv
+import numpy as np
 from program.location.location import Location
 from program.logger import LOGGER
+from program.world_bundle import WorldBundle
 from program.zone.zone import Zone
 
 # We have the problem that zones not all the time match some straight lines
@@ -13,51 +15,70 @@ class Zones:
     def get_zones() -> list[Zone]:
         if Zones._zones == None:
             LOGGER.debug("Starting to create zones")
-            Zones._zones = []
-
-            with open("data/zones.csv", mode="r") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    Zones._zones.append(
-                        Zone(
-                            int(row["zone_id"]),
-                            Location(
-                                float(row["zone_center_lat"]),
-                                float(row["zone_center_lon"]),
-                            ),
-                        )
-                    )
-
+            arrays = WorldBundle.get_arrays("zones", Zones.read_arrays)
+            Zones._zones = [
+                Zone(zone_id, Location(lat, lon))
+                for (zone_id, lat, lon) in zip(
+                    arrays["zone_ids"].tolist(),
+                    arrays["zone_center_lats"].tolist(),
+                    arrays["zone_center_lons"].tolist(),
+                )
+            ]
             LOGGER.debug("Finished to create zones")
 
-            zone_by_id = {zone.id: zone for zone in Zones._zones}
-
             LOGGER.debug("Set adjacent zones")
-            csv_file_path = "data/zone_neighborhoods_by_extended_distance.csv"
-            with open(csv_file_path, mode="r") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    zone_id = int(row["zone_id"])
-
-                    if zone_id not in zone_by_id:
-                        continue
-
-                    zone = zone_by_id[zone_id]
-
-                    for i in range(1, 21):
-                        zone.adjacent_zones_dict[i].extend(
-                            list(
-                                filter(
-                                    lambda x: x in zone_by_id,
-                                    map(
-                                        lambda x: int(x),
-                                        filter(
-                                            lambda x: x != "",
-                                            row[f"{i}"].strip("][").split(", "),
-                                        ),
-                                    ),
-                                )
-                            )
-                        )
+            offsets = arrays["adjacent_zone_offsets"].tolist()
+            adjacent_zone_ids = arrays["adjacent_zone_ids"].tolist()
+            for k in range(len(Zones._zones)):
+                for i in range(1, 21):
+                    position = k * 20 + i - 1
+                    Zones._zones[k].adjacent_zones_dict[i].extend(
+                        adjacent_zone_ids[offsets[position]:offsets[position + 1]]
+                    )
 
         return Zones._zones
+
+    # Zones in the order of the zones file. The adjacent zones with distance i of the zone in row k are
+    # adjacent_zone_ids[adjacent_zone_offsets[k * 20 + i - 1]:adjacent_zone_offsets[k * 20 + i]]
+    def read_arrays() -> dict[str, np.ndarray]:
+        zone_ids = []
+        zone_center_lats = []
+        zone_center_lons = []
+        with open("data/zones.csv", mode="r") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                zone_ids.append(int(row["zone_id"]))
+                zone_center_lats.append(float(row["zone_center_lat"]))
+                zone_center_lons.append(float(row["zone_center_lon"]))
+
+        # Zones with the same id only keep the adjacent zones in the last of their rows
+        row_by_zone_id = {zone_ids[k]: k for k in range(len(zone_ids))}
+        adjacent_zones = [[[] for _ in range(20)] for _ in zone_ids]
+        csv_file_path = "data/zone_neighborhoods_by_extended_distance.csv"
+        with open(csv_file_path, mode="r") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                zone_id = int(row["zone_id"])
+
+                if zone_id not in row_by_zone_id:
+                    continue
+
+                for i in range(1, 21):
+                    adjacent_zones[row_by_zone_id[zone_id]][i - 1].extend(
+                        [
+                            int(x)
+                            for x in row[f"{i}"].strip("][").split(", ")
+                            if x != "" and int(x) in row_by_zone_id
+                        ]
+                    )
+
+        lists = [ids for zone_lists in adjacent_zones for ids in zone_lists]
+        adjacent_zone_offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids in lists], out=adjacent_zone_offsets[1:])
+        return {
+            "zone_ids": np.array(zone_ids, dtype=np.int64),
+            "zone_center_lats": np.array(zone_center_lats, dtype=np.float64),
+            "zone_center_lons": np.array(zone_center_lons, dtype=np.float64),
+            "adjacent_zone_offsets": adjacent_zone_offsets,
+            "adjacent_zone_ids": np.array([x for ids in lists for x in ids], dtype=np.int64),
+        }
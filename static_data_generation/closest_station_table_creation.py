@@ -0,0 +1,9 @@
+from program.logger import LOGGER
+from program.public_transport.closest_station_table import ClosestStationTable
+
+
+# Recreates data/closest_stations.csv, the simulation also recreates it after changes to the grid cells or subway data
+def create_closest_station_table() -> None:
+    LOGGER.info("Creating closest station table")
+    ClosestStationTable._closest_station_table = ClosestStationTable.create()
+    ClosestStationTable._closest_station_table.export()
@@ -0,0 +1,9 @@
+from params.program_params import ProgramParams
+from program.logger import LOGGER
+from program.order.orders import Orders
+
+
+# Creates the binary order cache of the simulation date and ORDER_SAMPLING_SEED, needed after changes to the orders, grid cells or subway data
+def create_order_cache() -> None:
+    LOGGER.info(f"Creating order cache {ProgramParams.ORDERS_CACHE_FILE_PATH()}")
+    Orders.create_cache()
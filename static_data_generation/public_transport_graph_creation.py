@@ -1,11 +1,17 @@
-from collections import deque, namedtuple
+from collections import namedtuple
 import csv
+import heapq
 import math
-from params.program_params import ProgramParams
+import multiprocessing
+import os
+import shutil
+import sys
+import numpy as np
 from program.logger import LOGGER
+from program.public_transport.station_graph import create_edges
 
 # This file generates the fastest connection public transit network only
-# This is a Dijkstra algorithm. For a faster solution use the Floyd-Warshall algorithm to solve the all-pair shortest path problem (see code/model_builder)
+# One Dijkstra search per source station over a CSR adjacency gives the shortest paths to all other stations
 Edge = namedtuple("Edge", "start, end, cost")
 
 def create_edge(start, end, cost):
@@ -14,33 +20,49 @@ def create_edge(start, end, cost):
 class Graph:
     def __init__(self, edges):
         self.edges = [create_edge(*e) for e in edges]
+        self.nodes = list(self.vertices())
+        self.index_by_node = {node: i for i, node in enumerate(self.nodes)}
+
+        # CSR adjacency, the outgoing edges of node i are offsets[i]:offsets[i + 1] in the order of the edge list
+        starts = np.array([self.index_by_node[e.start] for e in self.edges], dtype=np.int64)
+        order = np.argsort(starts, kind="stable")
+        self.offsets = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(starts, minlength=len(self.nodes)), out=self.offsets[1:])
+        self.offsets = self.offsets.tolist()
+        self.targets = [self.index_by_node[self.edges[k].end] for k in order.tolist()]
+        self.costs = [self.edges[k].cost for k in order.tolist()]
 
     def vertices(self): 
         return set(e.start for e in self.edges).union(e.end for e in self.edges)
-    
-    def get_neighbours(self, v):
-        neighbours = []
-        for e in self.edges:
-            if e.start == v:
-                neighbours.append((e.end, e.cost))
-        return neighbours
-
-    def dijkstra(self, source, destination): 
-        distances = {v: float("inf") for v in self.vertices()} # each node gets a distance of infinity
-        prev_v = {v: None for v in self.vertices()} # each node gets a predecessor of None
-
-        distances[source] = 0 # the distance of the start node is set to 0
-        vertices = list(self.vertices())[:]
-        while len(vertices) > 0:
-            v = min(vertices, key=lambda u: distances[u]) # the node with the smallest distance is selected
-            vertices.remove(v) # the node is removed from the list
-            if distances[v] == float("inf"):
-                break # if the distance of the node is infinite, then there is no path to the destination node
-            for neighbour, cost in self.get_neighbours(v):
-                path_cost = distances[v] + cost # the distance of the neighbor is calculated
+
+    # Distances and predecessors of all nodes from the source. Nodes of equal distance are settled
+    # in the order of the node list and edges relaxed in the order of the edge list, so paths between
+    # equally fast connections are chosen like in a single search between two nodes.
+    def dijkstra(self, source):
+        distances = [float("inf")] * len(self.nodes) # each node gets a distance of infinity
+        prev_v = [None] * len(self.nodes) # each node gets a predecessor of None
+        is_settled = [False] * len(self.nodes)
+
+        distances[self.index_by_node[source]] = 0 # the distance of the start node is set to 0
+        heap = [(0, self.index_by_node[source])]
+        while len(heap) > 0:
+            (distance, v) = heapq.heappop(heap) # the node with the smallest distance is selected
+            if is_settled[v]:
+                continue
+            is_settled[v] = True
+            for k in range(self.offsets[v], self.offsets[v + 1]):
+                neighbour = self.targets[k]
+                path_cost = distance + self.costs[k] # the distance of the neighbor is calculated
                 if path_cost < distances[neighbour]:
                     distances[neighbour] = path_cost
-                    prev_v[neighbour] = v
+                    prev_v[neighbour] = self.nodes[v]
+                    heapq.heappush(heap, (path_cost, neighbour))
+        return (
+            {self.nodes[i]: distances[i] for i in range(len(self.nodes))},
+            {self.nodes[i]: prev_v[i] for i in range(len(self.nodes))},
+        )
+
+    def get_path(self, prev_v, distances, destination):
         path = []
         curr_v = destination
         while curr_v and prev_v[curr_v] is not None:
@@ -52,23 +74,6 @@ class Graph:
 
 ###############################################################################
 
-def lat_lon_to_meters(lat1, lon1, lat2, lon2):
-    # Conversion factors
-    meters_per_degree_lat = 111000  # approximately 111 kilometers per degree
-    meters_per_degree_lon = meters_per_degree_lat * math.cos(math.radians((lat1 + lat2) / 2))
-
-    # Conversion to meters
-    delta_lat_meters = (lat1 - lat2) * meters_per_degree_lat
-    delta_lon_meters = (lon1 - lon2) * meters_per_degree_lon
-
-    return delta_lat_meters, delta_lon_meters
-
-def manhattan_distance(lat1, lon1, lat2, lon2):
-    delta_lat_meters, delta_lon_meters = lat_lon_to_meters(lat1, lon1, lat2, lon2)
-    return abs(delta_lat_meters) + abs(delta_lon_meters)
-
-###############################################################################
-
 def read_csv_data(filename):
     data = []
     with open(filename, newline="", encoding="utf-8") as csvfile:
@@ -79,90 +84,71 @@ def read_csv_data(filename):
 
 ###############################################################################
 
-def create_edges(data):
-    edges = []
-    station_duration = ProgramParams.STATION_DURATION # Set the value for Station_Duration here
-    transfer_same_station = ProgramParams.TRANSFER_SAME_STATION  # Set the value for Transfer_Same_Station here
-    max_walking_duration = ProgramParams.MAX_WALKING_DURATION
-    walking_speed = ProgramParams.WALKING_SPEED 
-    
-    # Count variables for the different types of edges
-    line_edges_count = 0
-    transfer_edges_count = 0
-    remaining_edges_count = 0
-
-    # Helper functions and structures
-    id_to_name = {station_id: stop_name for station_id, stop_name, _ , _, _ in data}
-    name_to_ids = {}
-    for station_id, stop_name, _, _, _ in data:
-        if stop_name not in name_to_ids:
-            name_to_ids[stop_name] = []
-        name_to_ids[stop_name].append(station_id)
-
-    # Edges for the same line
-    for i in range(len(data) - 1):
-        id1, name1, line1, lat1, lon1 = data[i]
-        id2, name2, line2, lat2, lon2 = data[i + 1]
-        if line1 == line2:
-            edges.append((id1, id2, station_duration))
-            edges.append((id2, id1, station_duration))
-            line_edges_count += 1
-
-    # Edges for transfers at the same station
-    for i in range(len(data)):
-        for j in range(i + 1, len(data)):
-            id1, name1, line1, lat1, lon1 = data[i]
-            id2, name2, line2, lat2, lon2 = data[j]
-            if name1 == name2 and line1 != line2:
-                edges.append((id1, id2, transfer_same_station))
-                edges.append((id2, id1, transfer_same_station))
-                transfer_edges_count += 1
-    
-    for i in range(len(data)):
-        for j in range(i + 1, len(data)):
-            id1, name1, line1, lat1, lon1 = data[i]
-            id2, name2, line2, lat2, lon2 = data[j]
-            distance = manhattan_distance(lat1, lon1, lat2, lon2)
-            cost = distance * walking_speed  # Calculation of costs
-
-            if cost < max_walking_duration and not (line1 == line2 or name1 == name2):
-                edges.append((id1, id2, cost))
-                edges.append((id2, id1, cost))
-                remaining_edges_count += 1
-
-    LOGGER.info(f"Number of edges within the same line: {line_edges_count}")
-    LOGGER.info(f"Number of edges for transfers at the same station: {transfer_edges_count}")
-    LOGGER.info(f"Number of remaining edges: {remaining_edges_count}")
-    return edges
-
-# calculation of shortest paths
-def calculate_shortest_paths(graph, nodes):
-    paths = []
-    for i, start_node in enumerate(nodes):
-        for j, end_node in enumerate(nodes):
-            if i*j % (len(nodes)*len(nodes)*0.05) == 0:
-                LOGGER.info(f"{i*j} of {len(nodes)*len(nodes)} ({i*j // (len(nodes)*len(nodes)*0.05)}%) shortest paths calculated.")
-            if start_node != end_node:
-                shortest_path = graph.dijkstra(start_node, end_node)
-                paths.append((start_node, end_node, shortest_path))
-    return paths
-
-def save_paths_to_csv(paths, filename):
+
+# Graph of the worker processes, inherited from the main process by fork or built from the edges otherwise
+_graph = None
+
+def init_worker(graph, edges):
+    global _graph
+    _graph = graph if graph != None else Graph(edges)
+
+def partial_output_filename(chunk_index):
+    return f"data/shortest_paths_part_{chunk_index}.csv"
+
+# calculation of the shortest paths from a chunk of source stations to all stations, written to a partial output file
+def calculate_shortest_paths(chunk):
+    (chunk_index, start_nodes) = chunk
+    filename = partial_output_filename(chunk_index)
+    with open(filename, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        for start_node in start_nodes:
+            (distances, prev_v) = _graph.dijkstra(start_node)
+            for end_node in _graph.nodes:
+                if start_node != end_node:
+                    path = _graph.get_path(prev_v, distances, end_node)
+                    writer.writerow([start_node, end_node, " -> ".join(map(str, path))])
+    return filename
+
+def merge_partial_outputs(filenames, filename):
     with open(filename, mode="w", newline="", encoding="utf-8") as file:
         writer = csv.writer(file)
         writer.writerow(["start_station", "end_station", "connection"])
-        for start, end, path in paths:
-            writer.writerow([start, end, " -> ".join(map(str, path))])
-
+        for partial_filename in filenames:
+            with open(partial_filename, mode="r", newline="", encoding="utf-8") as partial_file:
+                shutil.copyfileobj(partial_file, file)
+            os.remove(partial_filename)
 
 
-def generate_shortest_paths_graph():
+# Source stations are split into contiguous chunks, so merging the partial outputs in chunk order keeps the row order
+def generate_shortest_paths_graph(processes=None):
     station_data = read_csv_data("data/continuous_subway_data.csv")
     station_data.sort(key=lambda x: x[0])
     edges = create_edges(station_data)
     graph = Graph(edges)
 
-    nodes = list(graph.vertices())  # List of all nodes (stations)
-    shortest_paths = calculate_shortest_paths(graph, nodes)
-    LOGGER.info("Saving begins")
-    save_paths_to_csv(shortest_paths, "data/shortest_paths.csv")
+    nodes = graph.nodes  # List of all nodes (stations)
+    processes = processes if processes != None else os.cpu_count()
+    chunk_size = max(1, math.ceil(len(nodes) / (4 * processes)))
+    chunks = [
+        (chunk_index, nodes[start:start + chunk_size])
+        for chunk_index, start in enumerate(range(0, len(nodes), chunk_size))
+    ]
+    # Fork shares the read-only graph with the workers without pickling it. It is not available on Windows
+    # and not safe on macOS, the workers of the default start method build the graph from the edges instead.
+    if sys.platform != "darwin" and "fork" in multiprocessing.get_all_start_methods():
+        (context, initargs) = (multiprocessing.get_context("fork"), (graph, None))
+    else:
+        (context, initargs) = (multiprocessing.get_context(), (None, edges))
+    filenames = []
+    try:
+        with context.Pool(processes=processes, initializer=init_worker, initargs=initargs) as pool:
+            for filename in pool.imap(calculate_shortest_paths, chunks):
+                filenames.append(filename)
+                LOGGER.info(f"{len(filenames)} of {len(chunks)} ({len(filenames) * 100 // len(chunks)}%) chunks of source stations calculated.")
+        LOGGER.info("Saving begins")
+        merge_partial_outputs(filenames, "data/shortest_paths.csv")
+    finally:
+        # Partial outputs are left over when a worker fails
+        for (chunk_index, _) in chunks:
+            if os.path.exists(partial_output_filename(chunk_index)):
+                os.remove(partial_output_filename(chunk_index))
@@ -5,7 +5,7 @@ from program.grid.grid import Grid
 from program.interval.time import Time
 from program.order.orders import Orders
 from params.program_params import ProgramParams
-from program.vehicle.vehicle import Vehicle
+from program.vehicle.vehicle import ID_PROVIDER
 
 
 def initialize_vehicle_positions() -> None:
@@ -16,30 +16,24 @@ def initialize_vehicle_positions() -> None:
     # and do a one to one mapping with vehicles, where each vehicle 
     # is positioned randomly in a radius of two GridCells from the order.
     grid = Grid.get_instance()
-    orders_by_time = Orders.get_orders_by_time()
     first_orders = []
     for minute in range(30):
-        first_orders.extend(orders_by_time[Time.of_total_minutes(minute)])
+        first_orders.extend(Orders.get_orders(Time.of_total_minutes(minute)))
     sampled_orders = random.Random(42).choices(first_orders, k=ProgramParams.AMOUNT_OF_VEHICLES)
 
     counter = 0
-    vehicles = []
+    positions = []
     for order in sampled_orders:
         cell = grid.find_cell(order.start)
         cells = list(filter(lambda x: not x.is_empty(), grid.find_n_adjacent_cells(cell, 2)))
         vehicle_cell = random.Random(counter).choice(cells)
-        vehicles.append(Vehicle(vehicle_cell.center))
+        positions.append(vehicle_cell.center)
         counter += 1
     if not os.path.exists("input_data"):
         os.makedirs("input_data")
     with open("input_data/vehicles.csv", mode="w") as file:
         writer = csv.writer(file)
         writer.writerow(["vehicle_id", "lat", "lon"])
-        for vehicle in vehicles:
-            writer.writerow(
-                [
-                    vehicle.id,
-                    vehicle.current_position.lat,
-                    vehicle.current_position.lon,
-                ]
-            )
\ No newline at end of file
+        # Positions are written directly, the fleet of the vehicles is created when the file is read
+        for position in positions:
+            writer.writerow([ID_PROVIDER.get_id(), position.lat, position.lon])
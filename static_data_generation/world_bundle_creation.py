@@ -0,0 +1,30 @@
+from program.grid.grid import Grid
+from program.logger import LOGGER
+from program.public_transport.fastest_station_connection_network import (
+    FastestStationConnectionNetwork,
+)
+from program.public_transport.transit_router import TransitRouter
+from program.world_bundle import WORLD_BUNDLE_FILE_PATH, WorldBundle
+from program.zone.zone_graph import ZoneGraph
+from program.zone.zones import Zones
+
+
+# Compiles the zones, zone neighborhoods, grid cells, zone graph, subway data and shortest paths into the world bundle,
+# together with the landmark distances of the transit router.
+# Needs to be recreated after changes to any of these files, the simulation reads them from the bundle while it exists
+def create_world_bundle() -> None:
+    LOGGER.info(f"Creating world bundle {WORLD_BUNDLE_FILE_PATH}")
+    # Everything is read from the csv files, an existing bundle may be outdated
+    station_arrays = FastestStationConnectionNetwork.read_station_arrays()
+    (stations, lines) = FastestStationConnectionNetwork.read_stations(station_arrays)
+    router = TransitRouter(stations, lines, TransitRouter.station_edges(station_arrays))
+    WorldBundle(
+        {
+            "zones": Zones.read_arrays(),
+            "grid_cells": Grid.read_arrays(),
+            "zone_graph": ZoneGraph.read_arrays(),
+            "stations": station_arrays,
+            "shortest_paths": FastestStationConnectionNetwork.read_connection_arrays(stations),
+            "transit_router_landmarks": router.compute_landmark_arrays(),
+        }
+    ).export(WORLD_BUNDLE_FILE_PATH)
@@ -0,0 +1,86 @@
+import csv
+import os
+import numpy as np
+import pytest
+from params.program_params import ProgramParams, TransitRouting
+from program.grid.grid import Grid
+from program.order.orders import Orders
+from program.public_transport.closest_station_table import ClosestStationTable
+from program.public_transport.fastest_station_connection_network import FastestStationConnectionNetwork
+from program.world_bundle import WorldBundle
+from program.zone.zones import Zones
+
+ZONE_IDS = [1, 2, 9999]
+
+# Cell centers of the default grid, a regular lattice of 6 x 7 cells
+GRID_LATS = [40.70 + 0.01 * i for i in range(6)]
+GRID_LONS = [-74.00 + 0.01 * j for j in range(7)]
+
+
+def zone_arrays() -> dict[str, np.ndarray]:
+    return {
+        "zone_ids": np.array(ZONE_IDS, dtype=np.int64),
+        "zone_center_lats": np.full(len(ZONE_IDS), 40.72),
+        "zone_center_lons": np.full(len(ZONE_IDS), -73.97),
+        "adjacent_zone_offsets": np.zeros(len(ZONE_IDS) * 20 + 1, dtype=np.int64),
+        "adjacent_zone_ids": np.zeros(0, dtype=np.int64),
+    }
+
+
+# Cells at all combinations of the center coordinates. The first column is empty,
+# the rest of each row is split between zone 1 and zone 2.
+def grid_cell_arrays(lats: list[float], lons: list[float]) -> dict[str, np.ndarray]:
+    zone_ids = [
+        9999 if j == 0 else (1 if j <= len(lons) // 2 else 2)
+        for _ in range(len(lats))
+        for j in range(len(lons))
+    ]
+    return {
+        "zone_ids": np.array(zone_ids, dtype=np.int64),
+        "lats": np.repeat(np.array(lats, dtype=np.float64), len(lons)),
+        "longs": np.tile(np.array(lons, dtype=np.float64), len(lats)),
+    }
+
+
+# Two lines crossing at a station of the same name, rows of data/continuous_subway_data.csv
+SUBWAY_ROWS = [
+    ("A", "North", 40.745, -73.975, 1),
+    ("A", "Center", 40.725, -73.965, 2),
+    ("A", "South", 40.705, -73.955, 3),
+    ("B", "West", 40.725, -73.995, 4),
+    ("B", "Center", 40.725, -73.965, 5),
+    ("B", "East", 40.725, -73.945, 6),
+]
+
+
+def write_subway_data() -> None:
+    os.makedirs("data", exist_ok=True)
+    with open("data/continuous_subway_data.csv", mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["line", "station_name", "LAT", "LONG", "station_id", "ID"])
+        for (line, name, lat, lon, station_id) in SUBWAY_ROWS:
+            writer.writerow([line, name, lat, lon, station_id, station_id])
+
+
+# Replaces the data folder by a small synthetic world. The test runs in an empty directory,
+# so no world bundle or other static data is read. The transit router computes the fastest connections
+# of the small subway network. Returns a function to change the grid cell centers.
+@pytest.fixture
+def world(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_subway_data()
+    monkeypatch.setattr(ProgramParams, "TRANSIT_ROUTING", TransitRouting.ROUTER)
+    monkeypatch.setattr(FastestStationConnectionNetwork, "_connection_network", None)
+    monkeypatch.setattr(WorldBundle, "_world_bundle", None)
+    monkeypatch.setattr(Zones, "_zones", None)
+    monkeypatch.setattr(Zones, "read_arrays", zone_arrays)
+
+    def set_grid_cells(lats: list[float], lons: list[float]) -> None:
+        monkeypatch.setattr(Grid, "_grid", None)
+        monkeypatch.setattr(ClosestStationTable, "_closest_station_table", None)
+        monkeypatch.setattr(Grid, "read_arrays", lambda: grid_cell_arrays(lats, lons))
+
+    set_grid_cells(GRID_LATS, GRID_LONS)
+    Orders.reset()
+    yield set_grid_cells
+    Orders.reset()
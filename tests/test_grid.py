@@ -0,0 +1,65 @@
+import numpy as np
+from program.grid.grid import Grid
+from program.location.location import Location
+from tests.conftest import GRID_LATS, GRID_LONS
+
+
+# Points inside and around the grid, the cell centers and the midpoints between neighboured centers
+def sample_points(lats: list[float], lons: list[float]) -> tuple[np.ndarray, np.ndarray]:
+    generator = np.random.default_rng(0)
+    margin = 2 * (lats[1] - lats[0])
+    random_lats = generator.uniform(lats[0] - margin, lats[-1] + margin, 20000)
+    random_lons = generator.uniform(lons[0] - margin, lons[-1] + margin, 20000)
+
+    boundary_lats = lats + [(lats[k] + lats[k + 1]) / 2 for k in range(len(lats) - 1)]
+    boundary_lons = lons + [(lons[k] + lons[k + 1]) / 2 for k in range(len(lons) - 1)]
+    (grid_lats, grid_lons) = np.meshgrid(boundary_lats, boundary_lons)
+    return (
+        np.concatenate([random_lats, grid_lats.ravel()]),
+        np.concatenate([random_lons, grid_lons.ravel()]),
+    )
+
+
+def assert_lookups_match_search(grid: Grid, lats: np.ndarray, lons: np.ndarray) -> None:
+    expected = [grid.search_cell(lat, lon) for (lat, lon) in zip(lats.tolist(), lons.tolist())]
+    assert [grid.find_cell(Location(lat, lon)) for (lat, lon) in zip(lats.tolist(), lons.tolist())] == expected
+    assert grid.find_cells(lats, lons).tolist() == [cell.id for cell in expected]
+    assert grid.find_zones(lats, lons).tolist() == [cell.zone.id for cell in expected]
+
+
+def test_raster_matches_binary_search(world):
+    grid = Grid.get_instance()
+    assert grid.raster_cell_ids is not None
+    assert_lookups_match_search(grid, *sample_points(GRID_LATS, GRID_LONS))
+
+
+def test_midpoint_next_to_empty_cell_is_not_empty(world):
+    grid = Grid.get_instance()
+    lon = (GRID_LONS[0] + GRID_LONS[1]) / 2
+    assert not grid.find_cell(Location(GRID_LATS[2], lon)).is_empty()
+    assert grid.find_zones(np.array([GRID_LATS[2]]), np.array([lon])).tolist() == [1]
+
+
+def test_irregular_grid_uses_binary_search(world):
+    # The gap of 1.5 cells puts a midpoint between two raster lines
+    lons = GRID_LONS[:3] + [GRID_LONS[2] + 0.015 + 0.01 * j for j in range(4)]
+    world(GRID_LATS, lons)
+    grid = Grid.get_instance()
+    assert grid.raster_cell_ids is None
+    assert_lookups_match_search(grid, *sample_points(GRID_LATS, lons))
+
+
+def search_cell_not_allowed(lat: float, lon: float):
+    raise AssertionError(f"Binary search for ({lat}, {lon})")
+
+
+def test_cell_centers_are_found_without_binary_search(world, monkeypatch):
+    grid = Grid.get_instance()
+    centers = [cell.center for row in grid.cells for cell in row]
+    expected = [grid.search_cell(center.lat, center.lon) for center in centers]
+    monkeypatch.setattr(grid, "search_cell", search_cell_not_allowed)
+    assert [grid.find_cell(center) for center in centers] == expected
+    lats = np.array([center.lat for center in centers])
+    lons = np.array([center.lon for center in centers])
+    assert grid.find_cells(lats, lons).tolist() == [cell.id for cell in expected]
+    assert grid.find_zones(lats, lons).tolist() == [cell.zone.id for cell in expected]
@@ -0,0 +1,55 @@
+import csv
+import os
+import pytest
+from params.program_params import ProgramParams
+from program.interval.time import Time
+from program.order.orders import Orders
+from tests.conftest import GRID_LATS, GRID_LONS
+
+
+def write_orders_file(count: int) -> None:
+    os.makedirs(os.path.dirname(ProgramParams.ORDERS_FILE_PATH()), exist_ok=True)
+    with open(ProgramParams.ORDERS_FILE_PATH(), mode="w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["pickup_time", "PULocationID", "DOLocationID"])
+        for k in range(count):
+            writer.writerow([f"{k // 60 % 24:02d}:{k % 60:02d}:00", 1 + k % 2, 2 - k % 2])
+
+
+def test_order_cache_is_kept_per_seed(world, monkeypatch):
+    write_orders_file(200)
+    for seed in [1, 2]:
+        monkeypatch.setattr(ProgramParams, "ORDER_SAMPLING_SEED", seed)
+        Orders.create_cache()
+
+    cells = {}
+    for seed in [1, 2]:
+        monkeypatch.setattr(ProgramParams, "ORDER_SAMPLING_SEED", seed)
+        Orders.load()
+        assert Orders._has_direct_connections
+        cells[seed] = (Orders._records["start_cell_id"].tolist(), Orders._records["end_cell_id"].tolist())
+        Orders.reset()
+
+        # The cache of a seed holds the cells sampled from the orders file with this seed
+        records = Orders.read_records()
+        assert cells[seed] == (records["start_cell_id"].tolist(), records["end_cell_id"].tolist())
+
+    assert cells[1] != cells[2]
+
+
+def test_order_cache_of_other_grid_cells_is_rejected(world):
+    write_orders_file(200)
+    Orders.create_cache()
+    world(GRID_LATS[:-1], GRID_LONS)
+    with pytest.raises(Exception, match="world_fingerprint"):
+        Orders.load()
+
+
+@pytest.mark.parametrize("read_ahead_minutes", [0, -5])
+def test_orders_are_created_without_read_ahead(world, monkeypatch, read_ahead_minutes):
+    write_orders_file(200)
+    Orders.create_cache()
+    monkeypatch.setattr(ProgramParams, "ORDER_READ_AHEAD_MINUTES", read_ahead_minutes)
+    for minute in range(3):
+        assert len(Orders.get_orders(Time(0, minute))) == 1
+        assert list(Orders._orders_by_minute) == [minute]